@@ -1,7 +1,14 @@
+from functools import lru_cache
 from pathlib import Path
 import re
 from app.config import get_setting
 
+# Compiled once; _extract_video_id tries them in order
+_VIDEO_ID_PATTERNS = (
+    re.compile(r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)'),
+    re.compile(r'youtube\.com/v/([^&\n?#]+)'),
+)
+
 class HTMLGenerator:
     """Generate the final HTML page"""
 
@@ -13,12 +20,39 @@ class HTMLGenerator:
         """Generate the HTML highlight page"""
         video_id = self._extract_video_id(youtube_url)
         
+        # Resolve everything that touches the filesystem up front so the cached
+        # render below only sees hashable, deterministic inputs
+        thumbnails_padded = thumbnails + [None] * (len(segments) - len(thumbnails))
+        cards = []
+        for i, segment in enumerate(segments):
+            thumbnail = thumbnails_padded[i] if i < len(thumbnails_padded) else None
+            thumbnail_name = Path(thumbnail).name if thumbnail and Path(thumbnail).exists() else None
+            cards.append((
+                int(segment['start']),
+                self._format_timestamp(segment['start']),
+                thumbnail_name,
+                segment.get('summary', segment['text'][:200] + '...'),
+            ))
+        
+        html_content = self._render_page(video_id, description or self.title, tuple(cards))
+        
+        html_path = self.output_dir / "index.html"
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+        
+        print(f"✅ HTML page generated: {html_path}")
+        return str(html_path)
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _render_page(video_id, heading, cards):
+        """Render the page for (start, timestamp, thumbnail name, summary) cards"""
         html_content = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{description or self.title} - Video Highlights</title>
+    <title>{heading} - Video Highlights</title>
     <style>
         * {{
             margin: 0;
@@ -243,7 +277,7 @@ class HTMLGenerator:
 <body>
     <div class="container">
         <div class="header">
-            <h1>{description or self.title}</h1>
+            <h1>{heading}</h1>
             <p>Key highlights from the video</p>
         </div>
         
@@ -277,15 +311,9 @@ class HTMLGenerator:
         <div class="highlights-grid">
 """
         
-        thumbnails_padded = thumbnails + [None] * (len(segments) - len(thumbnails))
-        
-        for i, segment in enumerate(segments):
-            start_time = int(segment['start'])
-            timestamp_display = self._format_timestamp(segment['start'])
-            thumbnail = thumbnails_padded[i] if i < len(thumbnails_padded) else None
-            
-            if thumbnail and Path(thumbnail).exists():
-                thumbnail_html = f'<img src="{Path(thumbnail).name}" alt="Thumbnail {i+1}" class="thumbnail">'
+        for i, (start_time, timestamp_display, thumbnail_name, summary) in enumerate(cards):
+            if thumbnail_name:
+                thumbnail_html = f'<img src="{thumbnail_name}" alt="Thumbnail {i+1}" class="thumbnail">'
             else:
                 youtube_thumb_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
                 thumbnail_html = f'<img src="{youtube_thumb_url}" alt="Thumbnail {i+1}" class="youtube-thumbnail">'
@@ -293,7 +321,7 @@ class HTMLGenerator:
             html_content += f"""
             <div class="highlight-card" data-timestamp="{start_time}">
                 {thumbnail_html}
-                <div class="summary">{segment.get('summary', segment['text'][:200] + '...')}</div>
+                <div class="summary">{summary}</div>
                 <div class="timestamp">Starts at {timestamp_display}</div>
                 <button class="watch-btn">Watch Segment</button>
             </div>
@@ -604,23 +632,12 @@ class HTMLGenerator:
 </body>
 </html>
 """
-        
-        html_path = self.output_dir / "index.html"
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        print(f"✅ HTML page generated: {html_path}")
-        return str(html_path)
+        return html_content
     
     def _extract_video_id(self, youtube_url):
         """Extract video ID from YouTube URL"""
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([^&\n?#]+)',
-            r'youtube\.com/v/([^&\n?#]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, youtube_url)
+        for pattern in _VIDEO_ID_PATTERNS:
+            match = pattern.search(youtube_url)
             if match:
                 return match.group(1)
         return "unknown"
@@ -1,11 +1,46 @@
+import os
 import re
+import mmap
+import codecs
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from app.transcript_formatter import TranscriptFormatter, TranscriptFormat
 
 logger = logging.getLogger(__name__)
 
+# Below this many segments the NumPy setup cost outweighs the scalar loop
+_VECTORIZE_MIN_SEGMENTS = 32
+
+# parse_many stays serial below this many files to avoid process start-up cost
+_PARALLEL_MIN_FILES = 4
+
+# Files larger than this are memory-mapped rather than read into a bytes copy
+_MMAP_MIN_SIZE = 256 * 1024
+
+# Cleanup patterns for the legacy parsers, compiled once rather than per caption line
+_TAG_RE = re.compile(r'<[^>]+>')
+_ENTITY_RE = re.compile(r'&[a-zA-Z0-9#]+;')
+_SRT_STYLE_RE = re.compile(r'\{[^}]*\}')
+_BARE_TIMESTAMP_RE = re.compile(r'^\d+:\d+$')
+_SOUND_TAG_RE = re.compile(r'^\[\w+\]$')
+_SRT_HEAD_RE = re.compile(r'^\d+\s*\n\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', re.MULTILINE)
+
+# Bytes read from the head of a file to sniff its format when the extension is unknown
+_SNIFF_BYTES = 1024
+
+# Byte-order marks checked before falling back to utf-8 / latin-1 decoding
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
 class TranscriptParser:
     """Parse WebVTT and SRT transcript files with robust error handling"""
 
@@ -29,14 +64,103 @@ class TranscriptParser:
         if not file_path.exists():
             raise FileNotFoundError(f"Transcript file not found: {file_path}")
         
-        if file_path.stat().st_size == 0:
+        stat = file_path.stat()
+        if stat.st_size == 0:
             raise ValueError(f"Transcript file is empty: {file_path}")
         
+        # Rewriting the file changes mtime/size, which invalidates the cached entry
+        cached = TranscriptParser._parse_cached(str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+        return [dict(segment) for segment in cached]
+    
+    @staticmethod
+    def parse_many(file_paths: List[Union[str, Path]], workers: Optional[int] = None) -> Dict[Path, List[Dict[str, Union[float, str]]]]:
+        """
+        Parse several transcript files, spreading them across worker processes.
+        
+        Parsing is CPU-bound regex work, so processes sidestep the GIL. Batches
+        smaller than _PARALLEL_MIN_FILES are parsed serially because starting
+        the pool would cost more than it saves.
+        
+        Args:
+            file_paths: Transcript files to parse
+            workers: Worker process count (defaults to os.cpu_count())
+            
+        Returns:
+            Mapping of each path to its parsed segments
+            
+        Raises:
+            ValueError, FileNotFoundError: As raised by parse() for any file
+        """
+        paths = [Path(file_path) for file_path in file_paths]
+        
+        if len(paths) < _PARALLEL_MIN_FILES or workers == 1:
+            return {path: TranscriptParser.parse(path) for path in paths}
+        
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            return dict(zip(paths, executor.map(TranscriptParser.parse, paths)))
+    
+    @staticmethod
+    def iter_parse(file_path: Union[str, Path]) -> Iterator[Dict[str, Union[float, str]]]:
+        """
+        Stream VTT/SRT cues from a transcript file one block at a time.
+        
+        Unlike parse(), the file is never held in memory as a whole, so large
+        transcripts can be consumed incrementally. Only timestamped cue formats
+        are handled; use parse() for format detection and fallbacks.
+        
+        Args:
+            file_path: Path to the transcript file
+            
+        Yields:
+            Transcript segments with start, end, and text
+            
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        file_path = Path(file_path)
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"Transcript file not found: {file_path}")
+        
+        formatter = TranscriptFormatter()
+        for block in TranscriptParser._iter_blocks(file_path):
+            segment = formatter.parse_cue_block(block)
+            if segment:
+                yield {'start': segment.start, 'end': segment.end, 'text': segment.text}
+    
+    @staticmethod
+    def _iter_blocks(file_path: Path) -> Iterator[List[str]]:
+        """Yield each blank-line-delimited block of a file as its stripped, non-empty lines"""
+        block: List[str] = []
+        
+        with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            # A trailing '' closes the final block when the file lacks a blank last line
+            for line in chain(f, ('',)):
+                line = line.strip()
+                if line:
+                    block.append(line)
+                elif block:
+                    yield block
+                    block = []
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _parse_cached(path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, Union[float, str]], ...]:
+        """Parse once per (path, mtime, size); callers get copies of the cached segments"""
+        return tuple(TranscriptParser._parse_uncached(Path(path)))
+    
+    @staticmethod
+    def _parse_uncached(file_path: Path) -> List[Dict[str, Union[float, str]]]:
+        """Run enhanced parsing, falling back to the legacy parsers"""
         # Try enhanced parsing first
         try:
-            segments = TranscriptParser._parse_with_formatter(file_path)
+            segments, detected_format = TranscriptParser._parse_with_formatter(file_path)
             if segments:
                 return segments
+            if detected_format != TranscriptFormat.UNKNOWN:
+                # The format was recognised and scanned; the legacy parsers would only rescan it
+                logger.warning(f"No segments found in {detected_format.value} transcript {file_path}")
+                return segments
         except Exception as e:
             logger.warning(f"Enhanced parsing failed for {file_path}: {e}")
         
@@ -56,8 +180,13 @@ class TranscriptParser:
             raise ValueError(f"Could not parse transcript file {file_path}: {e}")
     
     @staticmethod
-    def _parse_with_formatter(file_path: Path) -> List[Dict[str, Union[float, str]]]:
-        """Parse using the enhanced TranscriptFormatter"""
+    def _parse_with_formatter(file_path: Path) -> Tuple[List[Dict[str, Union[float, str]]], TranscriptFormat]:
+        """
+        Parse using the enhanced TranscriptFormatter.
+        
+        Returns the segments together with the detected format, which is
+        UNKNOWN when detection failed, was not confident enough or raised.
+        """
         try:
             # Read file content with encoding detection
             content = TranscriptParser._read_file_with_encoding_detection(file_path)
@@ -70,13 +199,13 @@ class TranscriptParser:
             
             if confidence < 0.2:
                 logger.warning(f"Low confidence format detection for {file_path}, trying legacy parsing")
-                return []
+                return [], TranscriptFormat.UNKNOWN
             
             # Parse with the formatter
             segments = formatter.parse_to_segments(content, detected_format)
             
             # Convert to the expected format
-            result_segments = []
+            result_segments: List[Dict[str, Union[float, str]]] = []
             for segment in segments:
                 result_segments.append({
                     'start': segment.start,
@@ -85,74 +214,63 @@ class TranscriptParser:
                 })
             
             logger.info(f"Successfully parsed {len(result_segments)} segments using enhanced formatter")
-            return result_segments
+            return result_segments, detected_format
             
         except Exception as e:
             logger.error(f"Enhanced parsing failed for {file_path}: {e}")
-            return []
+            return [], TranscriptFormat.UNKNOWN
     
     @staticmethod
     def _read_file_with_encoding_detection(file_path: Path) -> str:
-        """Read file with multiple encoding attempts"""
-        encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
+        """Read file once as bytes, then pick the encoding from its BOM or content"""
+        try:
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size > _MMAP_MIN_SIZE:
+                    # Decode straight from the mapped pages instead of copying into a bytes object
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        return TranscriptParser._decode_transcript(data, file_path)
+                return TranscriptParser._decode_transcript(f.read(), file_path)
+        except Exception as e:
+            raise ValueError(f"Could not read file {file_path} with any encoding: {e}")
+    
+    @staticmethod
+    def _decode_transcript(data: Union[bytes, mmap.mmap], file_path: Path) -> str:
+        """Decode raw transcript bytes (or a read-only mmap of them) to normalised text"""
+        if isinstance(data, bytes) and data.isascii():
+            # Common case: ASCII has no BOM and is valid UTF-8, so skip the sniffing
+            # and normalise newlines on the bytes before the single decode
+            if b'\r' in data:
+                data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+            return data.decode('ascii')
         
-        for encoding in encodings:
+        for bom, encoding in _BOM_ENCODINGS:
+            if data[:len(bom)] == bom:
+                content = str(data, encoding, 'replace')
+                logger.info(f"Successfully read {file_path} using {encoding} encoding")
+                break
+        else:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                if encoding != 'utf-8':
-                    logger.info(f"Successfully read {file_path} using {encoding} encoding")
-                return content
+                content = str(data, 'utf-8')
             except UnicodeDecodeError:
-                continue
+                # latin-1 maps every byte, so it always succeeds as the final fallback
+                content = str(data, 'latin-1')
+                logger.info(f"Successfully read {file_path} using latin-1 encoding")
         
-        # Final attempt with error replacement
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-                logger.warning(f"Read {file_path} with character replacement due to encoding issues")
-                return content
-        except Exception as e:
-            raise ValueError(f"Could not read file {file_path} with any encoding: {e}")
+        # Match text-mode universal newlines
+        return content.replace('\r\n', '\n').replace('\r', '\n')
 
     @staticmethod
     def _parse_vtt(file_path: Path) -> List[Dict[str, Union[float, str]]]:
         """Parse WebVTT format with robust error handling"""
         segments = []
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # Try different encodings
-            for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    logger.info(f"Successfully read file using {encoding} encoding")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError(f"Could not decode file with any supported encoding")
-        
-        # Normalize line endings
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Validate VTT format
-        if not content.strip().startswith('WEBVTT'):
-            logger.warning(f"File may not be valid VTT format: {file_path}")
-        
-        # More robust parsing approach
-        # Split content into blocks separated by empty lines
-        blocks = re.split(r'\n\s*\n', content)
-        
-        for block in blocks:
-            block = block.strip()
-            if not block or block.startswith('WEBVTT') or block.startswith('NOTE'):
+        # Stream the file block by block rather than reading and splitting it whole
+        for block_index, lines in enumerate(TranscriptParser._iter_blocks(file_path)):
+            if block_index == 0 and not lines[0].startswith('WEBVTT'):
+                logger.warning(f"File may not be valid VTT format: {file_path}")
+            if lines[0].startswith('WEBVTT') or lines[0].startswith('NOTE'):
                 continue
             
-            lines = [line.strip() for line in block.split('\n') if line.strip()]
             if len(lines) < 2:
                 continue
             
@@ -174,15 +292,13 @@ class TranscriptParser:
             if timestamp_line and text_lines:
                 try:
                     # Parse timestamp
-                    timestamp_parts = timestamp_line.split(' --> ')
-                    if len(timestamp_parts) != 2:
+                    start_time, _, end_time = timestamp_line.partition(' --> ')
+                    if ' --> ' in end_time:
                         continue
                     
-                    start_time = timestamp_parts[0].strip()
-                    end_time = timestamp_parts[1].strip()
-                    
+                    start_time = start_time.strip()
                     # Remove positioning/styling info from end time
-                    end_time = re.split(r'\s+', end_time)[0]
+                    end_time = end_time.split(None, 1)[0]
                     
                     start_seconds = TranscriptParser._time_to_seconds(start_time)
                     end_seconds = TranscriptParser._time_to_seconds(end_time)
@@ -191,18 +307,19 @@ class TranscriptParser:
                     clean_text_lines = []
                     for text_line in text_lines:
                         # Remove HTML tags and VTT styling
-                        clean_line = re.sub(r'<[^>]+>', '', text_line)
-                        clean_line = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_line)  # HTML entities
+                        clean_line = _TAG_RE.sub('', text_line)
+                        clean_line = _ENTITY_RE.sub('', clean_line)  # HTML entities
                         # Remove timestamp patterns that might be mixed in with text
-                        clean_line = re.sub(r'^\d+:\d+$', '', clean_line)  # Remove standalone timestamps like "0:02"
-                        clean_line = re.sub(r'^\[\w+\]$', '', clean_line)  # Remove [Music], [Applause] etc.
+                        clean_line = _BARE_TIMESTAMP_RE.sub('', clean_line)  # Remove standalone timestamps like "0:02"
+                        clean_line = _SOUND_TAG_RE.sub('', clean_line)  # Remove [Music], [Applause] etc.
                         clean_line = clean_line.strip()
                         
                         if clean_line and not clean_line.isdigit():
                             clean_text_lines.append(clean_line)
                     
                     if clean_text_lines:
-                        text = ' '.join(clean_text_lines)
+                        # Tag and entity removal can leave doubled spaces inside a line
+                        text = ' '.join(' '.join(clean_text_lines).split())
                         segments.append({
                             'start': start_seconds,
                             'end': end_seconds,
@@ -221,34 +338,8 @@ class TranscriptParser:
         """Parse SRT format with robust error handling"""
         segments = []
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # Try different encodings
-            for encoding in ['latin-1', 'cp1252', 'iso-8859-1']:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    logger.info(f"Successfully read file using {encoding} encoding")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            else:
-                raise ValueError(f"Could not decode file with any supported encoding")
-        
-        # Normalize line endings
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
-        
-        # Split into subtitle blocks
-        blocks = re.split(r'\n\s*\n', content.strip())
-        
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
-            
-            lines = [line.strip() for line in block.split('\n') if line.strip()]
+        # Stream the file block by block rather than reading and splitting it whole
+        for lines in TranscriptParser._iter_blocks(file_path):
             if len(lines) < 3:
                 continue
             
@@ -267,7 +358,9 @@ class TranscriptParser:
                 text_lines = lines[2:]
                 
                 # Parse timestamp
-                start_time_str, end_time_str = timestamp_line.split(' --> ')
+                start_time_str, _, end_time_str = timestamp_line.partition(' --> ')
+                if ' --> ' in end_time_str:
+                    continue
                 start_time_str = start_time_str.strip()
                 end_time_str = end_time_str.strip()
                 
@@ -279,18 +372,19 @@ class TranscriptParser:
                 clean_text_lines = []
                 for text_line in text_lines:
                     # Remove HTML tags
-                    clean_line = re.sub(r'<[^>]+>', '', text_line)
+                    clean_line = _TAG_RE.sub('', text_line)
                     # Remove common SRT formatting
-                    clean_line = re.sub(r'\{[^}]*\}', '', clean_line)
+                    clean_line = _SRT_STYLE_RE.sub('', clean_line)
                     # Remove HTML entities
-                    clean_line = re.sub(r'&[a-zA-Z0-9#]+;', '', clean_line)
+                    clean_line = _ENTITY_RE.sub('', clean_line)
                     clean_line = clean_line.strip()
                     
                     if clean_line:
                         clean_text_lines.append(clean_line)
                 
                 if clean_text_lines:
-                    text = ' '.join(clean_text_lines)
+                    # Tag and entity removal can leave doubled spaces inside a line
+                    text = ' '.join(' '.join(clean_text_lines).split())
                     segments.append({
                         'start': start_seconds,
                         'end': end_seconds,
@@ -304,17 +398,31 @@ class TranscriptParser:
         logger.info(f"Parsed {len(segments)} segments from SRT file: {file_path}")
         return segments
     
+    @staticmethod
+    def _sniff_format(file_path: Path) -> TranscriptFormat:
+        """Classify a file as VTT or SRT from its first bytes, without decoding the rest"""
+        with open(file_path, 'rb') as f:
+            head = f.read(_SNIFF_BYTES)
+        
+        if head.startswith(codecs.BOM_UTF8):
+            head = head[len(codecs.BOM_UTF8):]
+        head = head.lstrip()
+        if head.startswith(b'WEBVTT'):
+            return TranscriptFormat.VTT
+        if _SRT_HEAD_RE.search(head.decode('utf-8', 'replace').replace('\r\n', '\n')):
+            return TranscriptFormat.SRT
+        return TranscriptFormat.UNKNOWN
+    
     @staticmethod
     def _parse_auto_detect(file_path: Path) -> List[Dict[str, Union[float, str]]]:
         """Auto-detect format and parse"""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                content = f.read(1000)  # Read first 1KB for detection
+            detected_format = TranscriptParser._sniff_format(file_path)
             
-            if 'WEBVTT' in content:
+            if detected_format == TranscriptFormat.VTT:
                 logger.info(f"Auto-detected VTT format for {file_path}")
                 return TranscriptParser._parse_vtt(file_path)
-            elif re.search(r'^\d+\s*\n\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}', content, re.MULTILINE):
+            elif detected_format == TranscriptFormat.SRT:
                 logger.info(f"Auto-detected SRT format for {file_path}")
                 return TranscriptParser._parse_srt(file_path)
             else:
@@ -324,6 +432,7 @@ class TranscriptParser:
             raise ValueError(f"Auto-detection failed for {file_path}: {e}")
     
     @staticmethod
+    @lru_cache(maxsize=4096)  # consecutive cues share boundaries, so each timestamp recurs
     def _time_to_seconds(time_str: str) -> float:
         """Convert time string to seconds with robust parsing"""
         try:
@@ -349,12 +458,23 @@ class TranscriptParser:
             raise ValueError(f"Invalid time format: {time_str}")
     
     @staticmethod
-    def validate_segments(segments: List[Dict[str, Union[float, str]]]) -> List[Dict[str, Union[float, str]]]:
-        """Validate and clean up parsed segments"""
+    def validate_segments(segments: List[Dict[str, Union[float, str]]],
+                          remove_overlaps: bool = False) -> List[Dict[str, Union[float, str]]]:
+        """
+        Validate and clean up parsed segments.
+        
+        Overlapping segments are kept by default; pass remove_overlaps=True to
+        drop any segment that starts before the previously kept one ends.
+        """
         if not segments:
             return segments
         
-        cleaned_segments = []
+        if len(segments) > _VECTORIZE_MIN_SEGMENTS:
+            vectorized = TranscriptParser._validate_segments_vectorized(segments)
+            if vectorized is not None:
+                return TranscriptParser._drop_overlaps(vectorized) if remove_overlaps else vectorized
+        
+        cleaned_segments: List[Dict[str, Union[float, str]]] = []
         
         for i, segment in enumerate(segments):
             try:
@@ -391,7 +511,61 @@ class TranscriptParser:
                 continue
         
         # Sort by start time
-        cleaned_segments.sort(key=lambda x: x['start'])
+        cleaned_segments.sort(key=itemgetter('start'))
         
         logger.info(f"Validated {len(cleaned_segments)} segments out of {len(segments)} total")
+        return TranscriptParser._drop_overlaps(cleaned_segments) if remove_overlaps else cleaned_segments
+    
+    @staticmethod
+    def _drop_overlaps(sorted_segments: List[Dict[str, Union[float, str]]]) -> List[Dict[str, Union[float, str]]]:
+        """Single sweep over start-sorted segments, keeping each one that starts after the last kept end"""
+        kept = []
+        last_end = float('-inf')
+        for segment in sorted_segments:
+            start = float(segment['start'])
+            if start >= last_end:
+                kept.append(segment)
+                last_end = float(segment['end'])
+        
+        if len(kept) < len(sorted_segments):
+            logger.info(f"Dropped {len(sorted_segments) - len(kept)} overlapping segments")
+        return kept
+    
+    @staticmethod
+    def _validate_segments_vectorized(segments: List[Dict[str, Union[float, str]]]) -> Optional[List[Dict[str, Union[float, str]]]]:
+        """
+        NumPy fast path for validate_segments on large inputs.
+        
+        Returns None when a segment is malformed (missing fields, non-numeric
+        times) so the caller can fall back to the per-segment scalar path.
+        """
+        import numpy as np
+        
+        count = len(segments)
+        try:
+            starts = np.fromiter((float(s['start']) for s in segments), dtype=np.float64, count=count)
+            ends = np.fromiter((float(s['end']) for s in segments), dtype=np.float64, count=count)
+            texts = [str(s['text']).strip() for s in segments]
+        except (KeyError, ValueError, TypeError):
+            return None
+        
+        # Same rules as the scalar path, written as negations so NaN passes identically
+        keep = ~(starts < 0) & ~(ends < 0) & ~(starts >= ends)
+        keep &= np.fromiter((bool(text) for text in texts), dtype=bool, count=count)
+        
+        kept = np.flatnonzero(keep)
+        kept = kept[np.argsort(starts[kept], kind='stable')]
+        
+        skipped = count - len(kept)
+        if skipped:
+            logger.warning(f"Skipping {skipped} segments: negative timestamp, invalid time range or empty text")
+        
+        start_list = starts.tolist()
+        end_list = ends.tolist()
+        cleaned_segments = [
+            {'start': start_list[i], 'end': end_list[i], 'text': texts[i]}
+            for i in kept.tolist()
+        ]
+        
+        logger.info(f"Validated {len(cleaned_segments)} segments out of {count} total")
         return cleaned_segments
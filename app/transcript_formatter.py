@@ -1,12 +1,84 @@
 import re
+import sys
 import json
-from typing import List, Dict, Optional, Union, Tuple
-from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterator, List, Match, NamedTuple, Optional, Pattern, Tuple, Union, overload
 from enum import Enum
 import logging
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# orjson is an optional speedup (pip install .[fast]); its JSONDecodeError
+# subclasses json.JSONDecodeError, so the handlers below cover both
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import; detection and parsing run them per line.
+# All YouTube line variants form one alternation, so each line costs a single
+# match instead of one attempt per pattern; the variants are mutually exclusive.
+_YOUTUBE_LINE_RE = re.compile(
+    r'^(?:(\d{1,2}:\d{2})'           # "1:23 Some text"
+    r'|(\d{1,2}:\d{2}:\d{2})'         # "1:23:45 Some text"
+    r'|(\d{1,2}:\d{2}\.\d{3}))'       # "0:00.000 Some text"
+    r'\s+(?P<text>.+)$'
+)
+
+
+# Seconds per field, keyed by field count: MM:SS and HH:MM:SS
+_YOUTUBE_TS_COEFFS: Dict[int, Tuple[int, ...]] = {2: (60, 1), 3: (3600, 60, 1)}
+
+
+def _youtube_timestamp(match: Match[str]) -> str:
+    """Return whichever timestamp variant matched in a _YOUTUBE_LINE_RE match"""
+    return match.group(1) or match.group(2) or match.group(3)
+
+
+_TIMESTAMP_LINE_RE = re.compile(
+    r'\d{2}:\d{2}:\d{2}[\.,]\d{3}\s*-->\s*\d{2}:\d{2}:\d{2}[\.,]\d{3}'  # HH:MM:SS.mmm
+    r'|\d{1,2}:\d{2}[\.,]\d{3}\s*-->\s*\d{1,2}:\d{2}[\.,]\d{3}'         # MM:SS.mmm
+    r'|\d{1,2}:\d{2}\s*-->\s*\d{1,2}:\d{2}'                               # MM:SS
+)
+
+# One cue = timestamp line plus the non-blank text lines up to the next blank line.
+# Time groups are (hours?, minutes, seconds, millis?) for start then end.
+_CUE_TIME = r'(?:(\d{1,2}):)?(\d{1,2}):(\d{2})(?:[\.,](\d{1,3}))?'
+_CUE_BODY = (
+    r'[ \t]*' + _CUE_TIME + r'[ \t]+-->[ \t]+' + _CUE_TIME + r'[^\n]*\n'
+    r'((?:[ \t]*\S[^\n]*(?:\n|\Z))+)'
+)
+_VTT_CUE_RE = re.compile(r'^' + _CUE_BODY, re.M)
+# SRT cues carry a sequence-number line in front of the timestamp line
+_SRT_CUE_RE = re.compile(r'^[ \t]*\S[^\n]*\n' + _CUE_BODY, re.M)
+
+# Cue texts shorter than this (and pure ASCII) are interned
+_INTERN_MAX_LEN: int = 32
+
+_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n')
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def _cue_text(raw: str) -> str:
+    """Join a cue's text lines and collapse whitespace runs in one C-level pass"""
+    text = ' '.join(raw.split())
+    if len(text) < _INTERN_MAX_LEN and text.isascii():
+        # Auto-generated captions repeat short cues; share one string object
+        text = sys.intern(text)
+    return text
+
+
+def _fmt_ts(seconds: float) -> str:
+    """Format seconds as an HH:MM:SS.mmm VTT timestamp using integer milliseconds"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1_000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+
 
 class TranscriptFormat(Enum):
     """Supported transcript formats"""
@@ -18,29 +90,69 @@ class TranscriptFormat(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
-class TranscriptSegment:
+class TranscriptSegment(NamedTuple):
     """A single transcript segment with timing and text"""
     start: float
     end: float
     text: str
 
 
+class SegmentArray:
+    """
+    Column-oriented (struct-of-arrays) view of a segment list.
+    
+    Starts and ends live in float64 NumPy arrays so timing scans, sorts and
+    overlap checks run over contiguous memory; texts stay a plain list.
+    Indexing and iteration still hand out TranscriptSegment rows.
+    """
+    
+    __slots__ = ('starts', 'ends', 'texts')
+    
+    def __init__(self, starts: "np.ndarray", ends: "np.ndarray", texts: List[str]):
+        self.starts = starts
+        self.ends = ends
+        self.texts = texts
+    
+    @classmethod
+    def from_segments(cls, segments: List[TranscriptSegment]) -> 'SegmentArray':
+        """Build the columns from a list of segments"""
+        import numpy as np
+        
+        count = len(segments)
+        starts = np.fromiter((segment.start for segment in segments), dtype=np.float64, count=count)
+        ends = np.fromiter((segment.end for segment in segments), dtype=np.float64, count=count)
+        return cls(starts, ends, [segment.text for segment in segments])
+    
+    def to_segments(self) -> List[TranscriptSegment]:
+        """Materialize the columns back into a list of segments"""
+        return list(map(TranscriptSegment, self.starts.tolist(), self.ends.tolist(), self.texts))
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    @overload
+    def __getitem__(self, index: int) -> TranscriptSegment: ...
+    
+    @overload
+    def __getitem__(self, index: slice) -> 'SegmentArray': ...
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[TranscriptSegment, 'SegmentArray']:
+        if isinstance(index, slice):
+            # NumPy slices are views, so only the text list is copied
+            return SegmentArray(self.starts[index], self.ends[index], self.texts[index])
+        if not isinstance(index, int):
+            raise TypeError(f"SegmentArray indices must be integers or slices, not {type(index).__name__}")
+        return TranscriptSegment(float(self.starts[index]), float(self.ends[index]), self.texts[index])
+    
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        # One row at a time, so iterating never materializes the whole segment list
+        for start, end, text in zip(self.starts, self.ends, self.texts):
+            yield TranscriptSegment(float(start), float(end), text)
+
+
 class TranscriptFormatter:
     """Universal transcript format detector and converter"""
     
-    def __init__(self):
-        self.youtube_patterns = [
-            # YouTube format: "0:00 Some text" or "1:23 Some text"
-            r'^(\d{1,2}:\d{2})\s+(.+)$',
-            # YouTube format with seconds: "0:00:00 Some text" or "1:23:45 Some text"  
-            r'^(\d{1,2}:\d{2}:\d{2})\s+(.+)$',
-            # YouTube format with milliseconds: "0:00.000 Some text"
-            r'^(\d{1,2}:\d{2}\.\d{3})\s+(.+)$',
-            # YouTube format with hours: "1:23:45 Some text"
-            r'^(\d{1,2}:\d{2}:\d{2})\s+(.+)$'
-        ]
-    
     def detect_format(self, content: str) -> Tuple[TranscriptFormat, float]:
         """
         Detect transcript format with confidence score.
@@ -146,20 +258,18 @@ class TranscriptFormatter:
         if len(lines) < 2:
             return 0.0
         
-        matching_lines = 0
-        
-        for line in lines:
-            for pattern in self.youtube_patterns:
-                if re.match(pattern, line):
-                    matching_lines += 1
-                    break
+        # Every variant starts with a digit; the prefix check rejects prose
+        # lines without entering the regex engine
+        matching_lines = sum(
+            1 for line in lines if line[:1].isdigit() and _YOUTUBE_LINE_RE.match(line)
+        )
         
         return matching_lines / len(lines)
     
     def _check_json_format(self, content: str) -> float:
         """Check if content is JSON with timestamp data"""
         try:
-            data = json.loads(content)
+            data = _json_loads(content)
             if isinstance(data, list) and data:
                 # Check first few items for timestamp structure
                 sample_size = min(3, len(data))
@@ -182,14 +292,7 @@ class TranscriptFormatter:
     
     def _is_valid_timestamp_line(self, line: str) -> bool:
         """Check if line is a valid timestamp line"""
-        timestamp_patterns = [
-            r'\d{2}:\d{2}:\d{2}[\.,]\d{3}\s*-->\s*\d{2}:\d{2}:\d{2}[\.,]\d{3}',  # HH:MM:SS.mmm
-            r'\d{1,2}:\d{2}[\.,]\d{3}\s*-->\s*\d{1,2}:\d{2}[\.,]\d{3}',          # MM:SS.mmm
-            r'\d{1,2}:\d{2}\s*-->\s*\d{1,2}:\d{2}',                             # MM:SS
-            r'\d{2}:\d{2}:\d{2}\.\d{3}\s*-->\s*\d{2}:\d{2}:\d{2}\.\d{3}',       # Exact VTT format
-        ]
-        
-        return any(re.search(pattern, line) for pattern in timestamp_patterns)
+        return _TIMESTAMP_LINE_RE.search(line) is not None
     
     def convert_to_vtt(self, content: str, detected_format: Optional[TranscriptFormat] = None) -> str:
         """Convert any supported format to VTT"""
@@ -214,100 +317,84 @@ class TranscriptFormatter:
         else:
             return []
     
+    def parse_to_array(self, content: str, format_type: TranscriptFormat) -> SegmentArray:
+        """Parse content straight into a columnar SegmentArray"""
+        return SegmentArray.from_segments(self.parse_to_segments(content, format_type))
+    
     def _parse_vtt_segments(self, content: str) -> List[TranscriptSegment]:
         """Parse VTT format content"""
+        # Cues start after the WEBVTT header block
+        header_end = _BLOCK_SPLIT_RE.search(content)
+        if not header_end:
+            return []
+        return self._parse_cues(_VTT_CUE_RE, content, header_end.end())
+    
+    def _parse_srt_segments(self, content: str) -> List[TranscriptSegment]:
+        """Parse SRT format content"""
+        return self._parse_cues(_SRT_CUE_RE, content)
+    
+    @staticmethod
+    def _parse_cues(cue_re: Pattern[str], content: str, pos: int = 0) -> List[TranscriptSegment]:
+        """Build segments from every cue matched by a VTT/SRT cue pattern"""
         segments = []
-        blocks = re.split(r'\n\s*\n', content)
+        for match in cue_re.finditer(content, pos):
+            # Missing hour/millisecond groups default to '0', keeping the arithmetic branch-free
+            sh, sm, ss, sms, eh, em, es, ems, text = match.groups('0')
+            start_time = int(sh) * 3600 + int(sm) * 60 + int(ss) + int(sms) / 1000.0
+            end_time = int(eh) * 3600 + int(em) * 60 + int(es) + int(ems) / 1000.0
+            segments.append(TranscriptSegment(start_time, end_time, _cue_text(text)))
+        return segments
+    
+    def parse_cue_block(self, lines: List[str]) -> Optional[TranscriptSegment]:
+        """
+        Turn one blank-line-delimited VTT/SRT block into a segment.
         
-        for block in blocks[1:]:  # Skip WEBVTT header
-            lines = [line.strip() for line in block.split('\n') if line.strip()]
-            if len(lines) < 2:
-                continue
-            
-            # Find timestamp line
-            timestamp_line = None
-            text_lines = []
-            
-            for i, line in enumerate(lines):
-                if ' --> ' in line:
-                    timestamp_line = line
-                    text_lines = lines[i+1:]
-                    break
-            
-            if timestamp_line and text_lines:
+        Lines before the timing line (cue ids, SRT sequence numbers) are
+        ignored and the text is cleaned the same way as in parse_to_segments.
+        Returns None for blocks that are not cues, such as headers and NOTEs.
+        """
+        for i, line in enumerate(lines):
+            if ' --> ' in line:
+                text = _cue_text('\n'.join(lines[i + 1:]))
+                if not text:
+                    return None
                 try:
-                    start_time, end_time = self._parse_timestamp_line(timestamp_line)
-                    text = ' '.join(text_lines)
-                    segments.append(TranscriptSegment(start_time, end_time, text))
+                    start, end = self._parse_timestamp_line(line.strip())
                 except ValueError:
-                    continue
-        
-        return segments
+                    return None
+                return TranscriptSegment(start, end, text)
+        return None
     
-    def _parse_srt_segments(self, content: str) -> List[TranscriptSegment]:
-        """Parse SRT format content"""
+    def _parse_youtube_segments(self, content: str) -> List[TranscriptSegment]:
+        """Parse YouTube copy-paste format"""
         segments = []
-        blocks = re.split(r'\n\s*\n', content)
+        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        # Match each line once; the next line's match doubles as this line's end time
+        matches = [_YOUTUBE_LINE_RE.match(line) for line in lines]
         
-        for block in blocks:
-            lines = [line.strip() for line in block.split('\n') if line.strip()]
-            if len(lines) < 3:
+        for i, match in enumerate(matches):
+            if not match:
                 continue
             
-            # SRT format: number, timestamp, text lines
             try:
-                # Skip number line
-                timestamp_line = lines[1]
-                text_lines = lines[2:]
+                start_time = self._parse_youtube_timestamp(_youtube_timestamp(match))
+                # Estimate end time (next timestamp or +3 seconds)
+                end_time = start_time + 3.0
+                
+                next_match = matches[i + 1] if i + 1 < len(matches) else None
+                if next_match:
+                    end_time = self._parse_youtube_timestamp(_youtube_timestamp(next_match))
                 
-                if ' --> ' in timestamp_line:
-                    start_time, end_time = self._parse_timestamp_line(timestamp_line.replace(',', '.'))
-                    text = ' '.join(text_lines)
-                    segments.append(TranscriptSegment(start_time, end_time, text))
-            except (ValueError, IndexError):
+                segments.append(TranscriptSegment(start_time, end_time, match.group('text')))
+            except ValueError:
                 continue
         
         return segments
     
-    def _parse_youtube_segments(self, content: str) -> List[TranscriptSegment]:
-        """Parse YouTube copy-paste format"""
-        segments = []
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        
-        for i, line in enumerate(lines):
-            for pattern in self.youtube_patterns:
-                match = re.match(pattern, line)
-                if match:
-                    timestamp_str = match.group(1)
-                    text = match.group(2)
-                    
-                    try:
-                        start_time = self._parse_youtube_timestamp(timestamp_str)
-                        # Estimate end time (next timestamp or +3 seconds)
-                        end_time = start_time + 3.0
-                        
-                        if i + 1 < len(lines):
-                            next_match = None
-                            for next_pattern in self.youtube_patterns:
-                                next_match = re.match(next_pattern, lines[i + 1])
-                                if next_match:
-                                    break
-                            
-                            if next_match:
-                                next_time = self._parse_youtube_timestamp(next_match.group(1))
-                                end_time = next_time
-                        
-                        segments.append(TranscriptSegment(start_time, end_time, text))
-                        break
-                    except ValueError:
-                        continue
-        
-        return segments
-    
     def _parse_json_segments(self, content: str) -> List[TranscriptSegment]:
         """Parse JSON timestamp format"""
         try:
-            data = json.loads(content)
+            data = _json_loads(content)
             segments = []
             
             for item in data:
@@ -350,7 +437,7 @@ class TranscriptFormatter:
     
     def _parse_plain_text_segments(self, content: str) -> List[TranscriptSegment]:
         """Parse plain text by creating segments with estimated timing"""
-        sentences = re.split(r'(?<=[.!?])\s+', content)
+        sentences = _SENTENCE_SPLIT_RE.split(content)
         segments = []
         current_time = 0.0
         
@@ -385,62 +472,47 @@ class TranscriptFormatter:
     
     def _parse_time_string(self, time_str: str) -> float:
         """Parse time string like '00:01:30.500' or '1:30.500'"""
-        # Remove any extra formatting
-        time_str = re.split(r'\s+', time_str)[0]
+        # Drop cue settings or other trailing tokens
+        tokens = time_str.split(None, 1)
+        head, _, frac = (tokens[0] if tokens else '').replace(',', '.').partition('.')
+        parts = head.split(':')
+        
+        if len(parts) not in (2, 3) or not all(part.isdigit() for part in parts) or not (frac.isdigit() or not frac):
+            raise ValueError(f"Cannot parse time string: {time_str}")
         
-        # Handle different formats
-        if time_str.count(':') == 2:
+        if len(parts) == 3:
             # HH:MM:SS.mmm
-            match = re.match(r'(\d{1,2}):(\d{2}):(\d{2})(?:[\.,](\d{1,3}))?', time_str)
-            if match:
-                hours = int(match.group(1))
-                minutes = int(match.group(2))
-                seconds = int(match.group(3))
-                milliseconds = int(match.group(4) or 0)
-                return hours * 3600 + minutes * 60 + seconds + milliseconds / 1000.0
-        
-        elif time_str.count(':') == 1:
+            total = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+        else:
             # MM:SS.mmm
-            match = re.match(r'(\d{1,2}):(\d{2})(?:[\.,](\d{1,3}))?', time_str)
-            if match:
-                minutes = int(match.group(1))
-                seconds = int(match.group(2))
-                milliseconds = int(match.group(3) or 0)
-                return minutes * 60 + seconds + milliseconds / 1000.0
+            total = int(parts[0]) * 60 + int(parts[1])
         
-        raise ValueError(f"Cannot parse time string: {time_str}")
+        # Up to three fraction digits are read as a millisecond count, as _parse_cues does
+        return total + (int(frac[:3]) / 1000.0 if frac else 0.0)
     
     def _parse_youtube_timestamp(self, timestamp_str: str) -> float:
         """Parse YouTube format timestamp like '1:23' or '1:23:45'"""
         parts = timestamp_str.split(':')
+        coeffs = _YOUTUBE_TS_COEFFS.get(len(parts))
         
-        if len(parts) == 2:  # MM:SS
-            return int(parts[0]) * 60 + int(parts[1])
-        elif len(parts) == 3:  # HH:MM:SS
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        else:
+        if coeffs is None:
             raise ValueError(f"Invalid YouTube timestamp: {timestamp_str}")
+        
+        return float(sum(int(part) * coeff for part, coeff in zip(parts, coeffs)))
     
     def segments_to_vtt(self, segments: List[TranscriptSegment]) -> str:
         """Convert segments to VTT format"""
-        vtt_lines = ["WEBVTT", ""]
-        
-        for segment in segments:
-            start_time = self._seconds_to_vtt_time(segment.start)
-            end_time = self._seconds_to_vtt_time(segment.end)
-            
-            vtt_lines.append(f"{start_time} --> {end_time}")
-            vtt_lines.append(segment.text)
-            vtt_lines.append("")
-        
-        return "\n".join(vtt_lines)
+        # One preformatted cue per segment; the join adds the blank separator lines
+        vtt_parts = ["WEBVTT", ""]
+        vtt_parts.extend(
+            f"{_fmt_ts(segment.start)} --> {_fmt_ts(segment.end)}\n{segment.text}\n"
+            for segment in segments
+        )
+        return "\n".join(vtt_parts)
     
     def _seconds_to_vtt_time(self, seconds: float) -> str:
         """Convert seconds to VTT timestamp format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+        return _fmt_ts(seconds)
     
     def get_format_info(self, format_type: TranscriptFormat) -> Dict[str, str]:
         """Get human-readable information about a format"""
@@ -1,5 +1,9 @@
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 from pytube import YouTube
 from moviepy.editor import VideoFileClip
 from PIL import Image, ImageDraw, ImageFont, ImageEnhance
@@ -7,6 +11,27 @@ import requests
 import io
 from app.config import get_setting
 
+# Threads that resize and PNG-encode extracted frames while the next ones decode
+_THUMBNAIL_SAVE_WORKERS = min(4, os.cpu_count() or 1)
+
+# (path, mtime, size) of videos that passed _validate_cached_video; module-level so
+# the per-request processors the web server creates share it, and emptied once it
+# reaches _VALIDATED_VIDEOS_MAX so a long-running server does not grow it forever
+_VALIDATED_VIDEOS_MAX = 256
+_validated_videos: Set[Tuple[str, int, int]] = set()
+
+_FONT_PATH = "/System/Library/Fonts/Arial.ttf"
+
+
+@lru_cache(maxsize=16)
+def _load_font(size):
+    """Load the thumbnail font once per size, falling back to Pillow's default font"""
+    try:
+        return ImageFont.truetype(_FONT_PATH, size)
+    except IOError:
+        return ImageFont.load_default()
+
+
 class VideoProcessor:
     """Handle video download and frame extraction"""
 
@@ -108,17 +133,23 @@ class VideoProcessor:
     def _validate_cached_video(self, video_path):
         """Validate that cached video file is complete and playable"""
         try:
-            # Check file exists and has reasonable size
-            if not video_path.exists():
+            # Check file exists and has reasonable size; one stat answers both
+            try:
+                stat = video_path.stat()
+            except FileNotFoundError:
                 return False
             
-            file_size = video_path.stat().st_size
+            file_size = stat.st_size
             if file_size < 1024 * 100:  # Less than 100KB
                 print(f"⚠️  Video file too small: {file_size} bytes")
                 return False
             
+            # Opening the clip spawns ffmpeg and decodes a frame; do it once per file version
+            video_key = (str(video_path), stat.st_mtime_ns, file_size)
+            if video_key in _validated_videos:
+                return True
+            
             # Try to open with MoviePy (quick check)
-            from moviepy.editor import VideoFileClip
             try:
                 with VideoFileClip(str(video_path)) as test_clip:
                     if test_clip.duration <= 0:
@@ -135,6 +166,9 @@ class VideoProcessor:
                         print(f"⚠️  Frame extraction test failed: {frame_error}")
                         return False
                     
+                    if len(_validated_videos) >= _VALIDATED_VIDEOS_MAX:
+                        _validated_videos.clear()
+                    _validated_videos.add(video_key)
                     return True
             except Exception as clip_error:
                 print(f"⚠️  VideoFileClip validation failed: {clip_error}")
@@ -269,12 +303,13 @@ class VideoProcessor:
 
     def extract_thumbnails(self, video_path, segments):
         """Extract thumbnail images from video segments with enhanced error handling"""
-        thumbnails = []
+        thumbnails: List[Optional[str]] = []
         successful_extractions = 0
         extracted_frame_hashes = []  # Track visual similarity of extracted frames
         
         if video_path:
             video = None
+            save_pool = None
             try:
                 print("🖼️  Extracting thumbnails from video...")
                 print(f"📹 Video file: {video_path}")
@@ -302,6 +337,11 @@ class VideoProcessor:
                     print(f"❌ Invalid video duration: {video.duration}")
                     return self._fallback_thumbnail_generation(segments)
                 
+                # Pillow releases the GIL while resizing and encoding, so saving
+                # overlaps with decoding the next segment's frames
+                save_pool = ThreadPoolExecutor(max_workers=_THUMBNAIL_SAVE_WORKERS)
+                pending_saves = {}
+                
                 # Extract thumbnails for each segment with enhanced error handling
                 for i, segment in enumerate(segments):
                     thumbnail_path = None
@@ -339,14 +379,9 @@ class VideoProcessor:
                                         continue
                                 
                                 if frame_valid:
-                                    img = Image.fromarray(frame.astype('uint8'))
-                                    
-                                    # Resize to target dimensions while maintaining aspect ratio
-                                    img = self._resize_thumbnail(img)
-                                    
-                                    # Save thumbnail
+                                    # Resize and save thumbnail in the background
                                     thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.png"
-                                    img.save(thumbnail_path, "PNG", quality=95)
+                                    pending_saves[i] = save_pool.submit(self._save_frame_thumbnail, frame, thumbnail_path)
                                     
                                     print(f"✅ Extracted thumbnail {i+1} from {timestamp:.2f}s (attempt {attempt+1})")
                                     successful_extractions += 1
@@ -389,10 +424,8 @@ class VideoProcessor:
                                     frame = video.get_frame(timestamp)
                                     if frame is not None:
                                         # Accept ANY frame, no validation
-                                        img = Image.fromarray(frame.astype('uint8'))
-                                        img = self._resize_thumbnail(img)
                                         thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.png"
-                                        img.save(thumbnail_path, "PNG", quality=95)
+                                        pending_saves[i] = save_pool.submit(self._save_frame_thumbnail, frame, thumbnail_path)
                                         print(f"✅ Emergency extraction successful for segment {i+1} at {timestamp:.2f}s")
                                         successful_extractions += 1
                                         frame_extracted = True
@@ -408,10 +441,8 @@ class VideoProcessor:
                                     middle_time = video.duration / 2
                                     frame = video.get_frame(middle_time)
                                     if frame is not None:
-                                        img = Image.fromarray(frame.astype('uint8'))
-                                        img = self._resize_thumbnail(img)
                                         thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.png"
-                                        img.save(thumbnail_path, "PNG", quality=95)
+                                        pending_saves[i] = save_pool.submit(self._save_frame_thumbnail, frame, thumbnail_path)
                                         print(f"✅ Last resort extraction successful for segment {i+1} from video middle")
                                         successful_extractions += 1
                                         frame_extracted = True
@@ -427,6 +458,16 @@ class VideoProcessor:
                 # Clean up video resource
                 video.close()
                 
+                # Wait for the background saves; a failed write leaves no thumbnail
+                for i, future in pending_saves.items():
+                    try:
+                        future.result()
+                    except Exception as save_error:
+                        print(f"❌ Failed to save thumbnail {i+1}: {save_error}")
+                        thumbnails[i] = None
+                        successful_extractions -= 1
+                save_pool.shutdown()
+                
                 print(f"✅ Successfully extracted {successful_extractions}/{len(segments)} thumbnails")
                 
                 # Return thumbnails as-is - None values will be handled by HTML generator
@@ -444,10 +485,22 @@ class VideoProcessor:
                         video.close()
                     except:
                         pass
+                if save_pool:
+                    save_pool.shutdown()
                 return self._fallback_thumbnail_generation(segments)
         
         return self._fallback_thumbnail_generation(segments)
     
+    def _save_frame_thumbnail(self, frame, thumbnail_path):
+        """Resize an extracted frame to thumbnail size and write it as PNG"""
+        # MoviePy frames are already uint8 views over the decoder's read buffer;
+        # copy=False skips duplicating them when no conversion is needed
+        img = Image.fromarray(frame.astype('uint8', copy=False))
+        
+        # Resize to target dimensions while maintaining aspect ratio
+        img = self._resize_thumbnail(img)
+        img.save(thumbnail_path, "PNG", quality=95)
+    
     def _enhance_partial_thumbnails(self, thumbnails, segments):
         """Generate distinct fallback thumbnails for failed extractions"""
         print("🎨 Generating distinct fallbacks for failed thumbnail extractions...")
@@ -550,12 +603,8 @@ class VideoProcessor:
                 draw.rectangle([0, y, img.width, y + 1], fill=scheme["secondary"] + (alpha,))
         
         # Add large, prominent timestamp and segment info
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 48)  # Larger font
-            small_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 32)
-        except IOError:
-            font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
+        font = _load_font(48)  # Larger font
+        small_font = _load_font(32)
         
         # Add distinctive segment number
         segment_text = f"#{index + 1}"
@@ -604,12 +653,8 @@ class VideoProcessor:
                 draw.rectangle([0, y, img.width, y + 1], fill=blend_color)
             
             # Add large segment number
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 120)
-                small_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 36)
-            except IOError:
-                font = ImageFont.load_default()
-                small_font = ImageFont.load_default()
+            font = _load_font(120)
+            small_font = _load_font(36)
             
             segment_text = f"#{index + 1}"
             timestamp_text = self._format_timestamp(segment['start'])
@@ -639,47 +684,21 @@ class VideoProcessor:
             return None
     
     def _get_candidate_timestamps(self, segment, video_duration):
-        """Get multiple candidate timestamps for frame extraction with better spread"""
+        """Get up to five evenly spread candidate timestamps for frame extraction"""
         start_time = segment['start']
         end_time = segment.get('end', start_time + 10)  # Default to longer duration
         
-        # Ensure times are within video bounds
-        start_time = max(0.5, min(start_time, video_duration - 1.0))
-        end_time = max(start_time + 1.0, min(end_time, video_duration - 0.5))
-        
-        segment_duration = end_time - start_time
-        
-        # Generate more candidate timestamps with better distribution
-        candidates = []
-        
-        # Start with small offset to avoid transition frames
-        candidates.append(start_time + 0.5)
-        
-        # If segment is long enough, sample multiple points
-        if segment_duration > 2:
-            # Early, middle, and late in segment
-            candidates.append(start_time + segment_duration * 0.25)
-            candidates.append(start_time + segment_duration * 0.5)
-            candidates.append(start_time + segment_duration * 0.75)
-        
-        # Add more fallback positions
-        candidates.append(start_time + 1.0)  # 1 second after start
-        candidates.append(start_time + min(2.0, segment_duration - 0.5))  # 2 seconds after start or near end
-        
-        # Final fallbacks - try exact start and slightly before end
-        candidates.append(start_time)
-        if segment_duration > 3:
-            candidates.append(end_time - 1.0)
-        
-        # Ensure all candidates are within bounds and remove duplicates
-        valid_candidates = []
-        for t in candidates:
-            t_bounded = max(0.5, min(t, video_duration - 0.5))
-            # Only add if not too close to existing candidates
-            if not any(abs(t_bounded - existing) < 0.3 for existing in valid_candidates):
-                valid_candidates.append(t_bounded)
+        # Stay 0.2s inside the segment to avoid transition frames
+        first, last = start_time + 0.2, end_time - 0.2
+        if last - first < 0:
+            candidates = (first, (start_time + end_time) / 2)
+        else:
+            step = (last - first) / 4
+            candidates = tuple(first + i * step for i in range(5))
         
-        return valid_candidates[:8]  # Increase attempts to 8
+        # Clamp into the video, then drop duplicates the clamp may have created
+        upper = video_duration - 0.1
+        return sorted({round(min(max(t, 0.1), upper), 3) for t in candidates})
     
     def _is_valid_frame(self, frame):
         """Check if extracted frame is of good quality (not black, not corrupted)"""
@@ -701,8 +720,13 @@ class VideoProcessor:
             if frame.shape[2] != 3:
                 return False, f"Invalid color channels: {frame.shape[2]}, expected 3 (RGB)"
             
+            # Statistics on every 16th pixel in each direction touch 1/256th of
+            # the frame and are plenty for a black / blank / solid-colour check.
+            # Never write to the frame: it is handed on uncopied for saving
+            sample = frame[::16, ::16]
+            
             # Check if frame is not completely black or white
-            mean_brightness = np.mean(frame)
+            mean_brightness = sample.mean(dtype=np.float32)
             if mean_brightness < 5:
                 return False, f"Frame too dark (mean brightness: {mean_brightness:.1f})"
             
@@ -710,7 +734,7 @@ class VideoProcessor:
                 return False, f"Frame too bright (mean brightness: {mean_brightness:.1f})"
             
             # Check for sufficient variation (not a solid color) - relaxed threshold
-            std_brightness = np.std(frame)
+            std_brightness = sample.std(dtype=np.float32)
             if std_brightness < 5:  # Reduced from 10 to 5 for more lenient validation
                 return False, f"Frame lacks variation (std: {std_brightness:.1f})"
             
@@ -791,9 +815,18 @@ class VideoProcessor:
             new_height = target_height
             new_width = int(target_height * img_aspect)
         
+        # Box-reduce by the whole factor first so LANCZOS only filters the last <2x
+        reduce_factor = min(img.width // max(new_width, 1), img.height // max(new_height, 1))
+        if reduce_factor >= 2:
+            img = img.reduce(reduce_factor)
+        
         # Resize image
         img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
         
+        # Same aspect ratio: nothing to letterbox
+        if img_resized.size == (target_width, target_height) and img_resized.mode == 'RGB':
+            return img_resized
+        
         # Create final image with target dimensions and center the resized image
         final_img = Image.new('RGB', (target_width, target_height), (0, 0, 0))
         
@@ -829,47 +862,55 @@ class VideoProcessor:
         if not self.video_id:
             return None
         
-        thumbnails = []
+        thumbnails: List[Optional[str]] = []
         successful_downloads = 0
         
         print("🎬 Attempting to download YouTube timestamp thumbnails...")
         
-        for i, segment in enumerate(segments):
-            thumbnail_path = None
-            timestamp = int(segment['start'])
-            
-            # YouTube thumbnail URLs for different moments
-            thumbnail_urls = [
-                f"https://img.youtube.com/vi/{self.video_id}/maxres{i+1}.jpg",  # Different thumbnail variants
-                f"https://i3.ytimg.com/vi/{self.video_id}/maxresdefault.jpg",
-                f"https://img.youtube.com/vi/{self.video_id}/hqdefault.jpg",
-            ]
-            
-            for url_idx, url in enumerate(thumbnail_urls):
-                try:
-                    response = requests.get(url, timeout=10)
-                    response.raise_for_status()
-                    
-                    # Check if we got a valid image
-                    img = Image.open(io.BytesIO(response.content))
-                    
-                    # Apply timestamp-specific styling to make them unique
-                    img = self._style_timestamp_thumbnail(img, i, segment, timestamp)
-                    
-                    # Resize and save
-                    img = self._resize_thumbnail(img)
-                    thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.png"
-                    img.save(thumbnail_path, "PNG", quality=95)
-                    
-                    print(f"✅ Downloaded YouTube thumbnail {i+1} (variant {url_idx+1})")
-                    successful_downloads += 1
-                    break
-                    
-                except Exception as e:
-                    print(f"⚠️  Failed to download thumbnail variant {url_idx+1} for segment {i+1}: {e}")
-                    continue
-            
-            thumbnails.append(str(thumbnail_path) if thumbnail_path else None)
+        # The fallback variants are the same URLs for every segment; download and
+        # decode each once and style a copy per segment. The per-segment maxresN
+        # URLs are fetched only once anyway, so they bypass the cache.
+        shared_urls = (
+            f"https://i3.ytimg.com/vi/{self.video_id}/maxresdefault.jpg",
+            f"https://img.youtube.com/vi/{self.video_id}/hqdefault.jpg",
+        )
+        downloaded: Dict[str, Optional[Image.Image]] = {}
+        
+        # One session for every segment keeps the TLS connections to the thumbnail hosts alive
+        with requests.Session() as session:
+            for i, segment in enumerate(segments):
+                thumbnail_path = None
+                timestamp = int(segment['start'])
+                
+                # YouTube thumbnail URLs for different moments
+                thumbnail_urls = [
+                    f"https://img.youtube.com/vi/{self.video_id}/maxres{i+1}.jpg",  # Different thumbnail variants
+                    *shared_urls,
+                ]
+                
+                for url_idx, url in enumerate(thumbnail_urls):
+                    try:
+                        img = self._fetch_thumbnail_image(session, url, downloaded if url in shared_urls else None)
+                        if img is None:
+                            continue
+                        
+                        # Apply timestamp-specific styling to make them unique
+                        img = self._style_timestamp_thumbnail(img, i, segment, timestamp)
+                        
+                        # Resize and save
+                        img = self._resize_thumbnail(img)
+                        thumbnail_path = self.output_dir / f"thumbnail_{i+1:03d}.png"
+                        img.save(thumbnail_path, "PNG", quality=95)
+                        
+                        print(f"✅ Downloaded YouTube thumbnail {i+1} (variant {url_idx+1})")
+                        successful_downloads += 1
+                        break
+                        
+                    except Exception as e:
+                        print(f"⚠️  Failed to download thumbnail variant {url_idx+1} for segment {i+1}: {e}")
+                        continue
+                
+                thumbnails.append(str(thumbnail_path) if thumbnail_path else None)
         
         if successful_downloads > 0:
             print(f"✅ Successfully downloaded {successful_downloads}/{len(segments)} YouTube thumbnails")
@@ -877,11 +918,40 @@ class VideoProcessor:
         
         return None
     
+    def _fetch_thumbnail_image(self, session, url, cache=None):
+        """
+        Download and decode one thumbnail image.
+        
+        With a cache, each URL is fetched once per batch: the decoded image or,
+        after a failed download or decode, None is stored and never replaced.
+        Only the first attempt raises; later calls return the cached entry.
+        """
+        if cache is not None and url in cache:
+            return cache[url]
+        
+        try:
+            response = session.get(url, timeout=10)
+            response.raise_for_status()
+            
+            # Decode eagerly so undecodable bytes fail here rather than during styling
+            img = Image.open(io.BytesIO(response.content))
+            img.load()
+        except Exception:
+            if cache is not None:
+                cache[url] = None
+            raise
+        
+        if cache is not None:
+            cache[url] = img
+        return img
+    
     def _style_timestamp_thumbnail(self, img, index, segment, timestamp):
         """Apply timestamp-specific styling to make YouTube thumbnails unique"""
         # Create a styled version with timestamp overlay and color theming
         styled_img = img.copy().convert('RGB')
-        draw = ImageDraw.Draw(styled_img)
+        # An RGBA draw blends each translucent shape straight onto the copy,
+        # avoiding a full-size overlay layer and composite pass per thumbnail
+        overlay_draw = ImageDraw.Draw(styled_img, 'RGBA')
         
         # Color schemes for each segment
         color_schemes = [
@@ -897,10 +967,6 @@ class VideoProcessor:
         primary_color = color_scheme["primary"]
         secondary_color = color_scheme["secondary"]
         
-        # Add gradient overlay in corner
-        overlay = Image.new('RGBA', styled_img.size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        
         # Create corner overlay
         corner_size = min(styled_img.width // 3, styled_img.height // 3, 200)
         
@@ -922,12 +988,8 @@ class VideoProcessor:
         # Add timestamp
         timestamp_text = self._format_timestamp(segment['start'])
         
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 36)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 24)
-        except IOError:
-            font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
+        font = _load_font(36)
+        small_font = _load_font(24)
         
         # Position timestamp based on corner
         text_bbox = overlay_draw.textbbox((0, 0), timestamp_text, font=font)
@@ -968,9 +1030,6 @@ class VideoProcessor:
                             fill=primary_color + (255,))
         overlay_draw.text((seg_x, seg_y), segment_text, fill=(255, 255, 255), font=small_font)
         
-        # Apply overlay
-        styled_img = Image.alpha_composite(styled_img.convert('RGBA'), overlay).convert('RGB')
-        
         return styled_img
 
     def _generate_custom_thumbnails(self, segments):
@@ -1048,12 +1107,8 @@ class VideoProcessor:
         color_scheme = color_schemes[index % len(color_schemes)]
         gradient_color = color_scheme["gradient"]
 
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 64)
-            small_font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 42)
-        except IOError:
-            font = ImageFont.load_default()
-            small_font = ImageFont.load_default()
+        font = _load_font(64)
+        small_font = _load_font(42)
 
         # Add timestamp
         text_bbox = draw.textbbox((0, 0), timestamp, font=font)
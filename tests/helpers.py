@@ -0,0 +1,46 @@
+import os
+from types import SimpleNamespace
+
+
+def mkfile(path, data=b""):
+    """Create a small fixture file with a single raw write (no text encoding pass)"""
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if data:
+            os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def make_files(paths, data=b"test content"):
+    """Create several fixture files sharing the same payload"""
+    for path in paths:
+        mkfile(path, data)
+
+
+def names(path):
+    """Return the set of entry names in a directory from a single scandir pass"""
+    with os.scandir(path) as entries:
+        return {entry.name for entry in entries}
+
+
+class FakeRun:
+    """Minimal stand-in for subprocess.run that returns a canned result or raises"""
+
+    def __init__(self, result=None, exc=None):
+        self.result = result
+        self.exc = exc
+        self.call_count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.call_count += 1
+        if self.exc is not None:
+            raise self.exc
+        return self.result
+
+
+def resp(text="", status_code=200, stdout="", stderr="", content=b""):
+    """Lightweight stand-in for subprocess/HTTP results where a Mock is overkill"""
+    return SimpleNamespace(text=text, status_code=status_code,
+                           stdout=stdout, stderr=stderr, content=content,
+                           raise_for_status=lambda: None)
@@ -1,16 +1,30 @@
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from pathlib import Path
-import tempfile
-import shutil
+from unittest.mock import patch
+import subprocess
 from app.transcript_downloader import TranscriptDownloader
+from tests.helpers import FakeRun, make_files, mkfile, names, resp
+
+# Fixture file contents, pre-encoded once for the whole module
+_VTT_SAMPLE = b"WEBVTT\n\n00:00:01.000 --> 00:00:03.000\nTest content"
+_SRT_SAMPLE = b"1\n00:00:01,000 --> 00:00:03,000\nValid content"
+_INVALID_VTT = b"This is not a valid VTT file"
+
+# Canned yt-dlp results, built once for the whole module
+_YTDLP_SUCCESS = resp(stdout="Download completed")
+_YTDLP_NO_SUBTITLES = resp(stdout="There are no subtitles for the requested languages")
+_YTDLP_TIMEOUT = subprocess.TimeoutExpired("yt-dlp", 120)
+_YTDLP_CMD = ["yt-dlp", "--skip-download", "test_url"]
+
+_EXECUTE_CASES = (
+    (_YTDLP_SUCCESS, None, True),
+    (_YTDLP_NO_SUBTITLES, None, False),
+    (None, _YTDLP_TIMEOUT, False),
+)
 
 @pytest.fixture
-def temp_cache_dir():
+def temp_cache_dir(tmp_path):
     """Create a temporary cache directory for testing"""
-    temp_dir = tempfile.mkdtemp()
-    yield Path(temp_dir)
-    shutil.rmtree(temp_dir)
+    return tmp_path
 
 @pytest.fixture
 def downloader(temp_cache_dir):
@@ -48,7 +62,7 @@ class TestTranscriptDownloader:
         # Create a cached file
         video_id = "test_video_123"
         cached_file = temp_cache_dir / f"{video_id}.vtt"
-        cached_file.write_text("WEBVTT\n\n00:00:01.000 --> 00:00:03.000\nTest content")
+        mkfile(cached_file, _VTT_SAMPLE)
         
         result = downloader._find_cached_transcript(video_id)
         assert result == cached_file
@@ -57,7 +71,7 @@ class TestTranscriptDownloader:
         """Test finding cached transcript with language suffix"""
         video_id = "test_video_123"
         cached_file = temp_cache_dir / f"{video_id}.en.vtt"
-        cached_file.write_text("WEBVTT\n\n00:00:01.000 --> 00:00:03.000\nTest content")
+        mkfile(cached_file, _VTT_SAMPLE)
         
         result = downloader._find_cached_transcript(video_id)
         assert result == cached_file
@@ -66,7 +80,7 @@ class TestTranscriptDownloader:
         """Test that empty cached files are still found (validation happens later)"""
         video_id = "test_video_123"
         empty_file = temp_cache_dir / f"{video_id}.vtt"
-        empty_file.touch()  # Create empty file
+        mkfile(empty_file)  # Create empty file
         
         result = downloader._find_cached_transcript(video_id)
         assert result == empty_file  # Empty files are found, but validation will catch them
@@ -80,7 +94,7 @@ class TestTranscriptDownloader:
     def test_validate_transcript_file_valid_vtt(self, downloader, temp_cache_dir):
         """Test validation of valid VTT file"""
         vtt_file = temp_cache_dir / "test.vtt"
-        vtt_file.write_text("WEBVTT\n\n00:00:01.000 --> 00:00:03.000\nValid content")
+        mkfile(vtt_file, _VTT_SAMPLE)
         
         result = downloader._validate_transcript_file(vtt_file)
         assert result is True
@@ -88,7 +102,7 @@ class TestTranscriptDownloader:
     def test_validate_transcript_file_valid_srt(self, downloader, temp_cache_dir):
         """Test validation of valid SRT file"""
         srt_file = temp_cache_dir / "test.srt"
-        srt_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nValid content")
+        mkfile(srt_file, _SRT_SAMPLE)
         
         result = downloader._validate_transcript_file(srt_file)
         assert result is True
@@ -96,7 +110,7 @@ class TestTranscriptDownloader:
     def test_validate_transcript_file_empty(self, downloader, temp_cache_dir):
         """Test validation of empty file (should be removed)"""
         empty_file = temp_cache_dir / "test.vtt"
-        empty_file.touch()
+        mkfile(empty_file)
         
         result = downloader._validate_transcript_file(empty_file)
         assert result is False
@@ -105,56 +119,34 @@ class TestTranscriptDownloader:
     def test_validate_transcript_file_invalid_vtt(self, downloader, temp_cache_dir):
         """Test validation of invalid VTT file"""
         invalid_file = temp_cache_dir / "test.vtt"
-        invalid_file.write_text("This is not a valid VTT file")
+        mkfile(invalid_file, _INVALID_VTT)
         
         result = downloader._validate_transcript_file(invalid_file)
         assert result is False
     
-    @patch('subprocess.run')
-    def test_execute_ytdlp_command_success(self, mock_run, downloader, temp_cache_dir):
-        """Test successful yt-dlp command execution"""
-        # Mock successful subprocess run
-        mock_result = Mock()
-        mock_result.stdout = "Download completed"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-        
-        # Create a file that would be "downloaded"
+    @pytest.mark.parametrize(
+        "result,exc,expect_file",
+        _EXECUTE_CASES,
+        ids=["success", "no_subtitles", "timeout"],
+    )
+    def test_execute_ytdlp_command(self, monkeypatch, downloader, temp_cache_dir,
+                                   result, exc, expect_file):
+        """Test yt-dlp command execution: success, no subtitles and timeout"""
+        fake_run = FakeRun(result, exc=exc)
+        monkeypatch.setattr(subprocess, "run", fake_run)
+        monkeypatch.setattr(downloader, "retry_delay", 0)  # Skip real backoff sleeps
+        
         video_id = "test_video"
         downloaded_file = temp_cache_dir / f"{video_id}.en.vtt"
-        downloaded_file.write_text("WEBVTT\n\n00:00:01.000 --> 00:00:03.000\nTest")
-        
-        cmd = ["yt-dlp", "--skip-download", "test_url"]
-        result = downloader._execute_ytdlp_command(cmd, video_id)
+        if expect_file:
+            # Create a file that would be "downloaded"
+            mkfile(downloaded_file, _VTT_SAMPLE)
         
-        assert result == str(downloaded_file)
-        mock_run.assert_called_once()
-    
-    @patch('subprocess.run')
-    def test_execute_ytdlp_command_no_subtitles(self, mock_run, downloader):
-        """Test yt-dlp command when no subtitles are available"""
-        # Mock subprocess run that indicates no subtitles
-        mock_result = Mock()
-        mock_result.stdout = "There are no subtitles for the requested languages"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-        
-        cmd = ["yt-dlp", "--skip-download", "test_url"]
-        result = downloader._execute_ytdlp_command(cmd, "test_video")
+        found = downloader._execute_ytdlp_command(_YTDLP_CMD, video_id)
         
-        assert result is None
-        mock_run.assert_called_once()
-    
-    @patch('subprocess.run')
-    def test_execute_ytdlp_command_timeout(self, mock_run, downloader):
-        """Test yt-dlp command timeout handling"""
-        import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired("yt-dlp", 120)
-        
-        cmd = ["yt-dlp", "--skip-download", "test_url"]
-        result = downloader._execute_ytdlp_command(cmd, "test_video")
-        
-        assert result is None
+        assert found == (str(downloaded_file) if expect_file else None)
+        if exc is None:
+            assert fake_run.call_count == 1
     
     def test_clear_cache_specific_video(self, downloader, temp_cache_dir):
         """Test clearing cache for specific video"""
@@ -165,16 +157,16 @@ class TestTranscriptDownloader:
         file2 = temp_cache_dir / f"{video_id}.en.vtt"
         file3 = temp_cache_dir / "other_video.vtt"
         
-        for f in [file1, file2, file3]:
-            f.write_text("test content")
+        make_files([file1, file2, file3])
         
         # Clear cache for specific video
         downloader.clear_cache(video_id)
         
         # Check that only the specific video files were removed
-        assert not file1.exists()
-        assert not file2.exists()
-        assert file3.exists()
+        remaining = names(temp_cache_dir)
+        assert file1.name not in remaining
+        assert file2.name not in remaining
+        assert file3.name in remaining
     
     def test_clear_cache_all(self, downloader, temp_cache_dir):
         """Test clearing entire cache"""
@@ -186,17 +178,17 @@ class TestTranscriptDownloader:
             temp_cache_dir / "not_transcript.txt"  # Should not be removed
         ]
         
-        for f in files:
-            f.write_text("test content")
+        make_files(files)
         
         # Clear entire cache
         downloader.clear_cache()
         
         # Check that transcript files were removed but other files remain
-        assert not files[0].exists()
-        assert not files[1].exists() 
-        assert not files[2].exists()
-        assert files[3].exists()  # Non-transcript file should remain
+        remaining = names(temp_cache_dir)
+        assert files[0].name not in remaining
+        assert files[1].name not in remaining
+        assert files[2].name not in remaining
+        assert files[3].name in remaining  # Non-transcript file should remain
 
     @patch.object(TranscriptDownloader, '_download_with_ytdlp_manual')
     @patch.object(TranscriptDownloader, '_download_with_ytdlp_auto')
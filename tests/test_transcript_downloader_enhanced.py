@@ -1,46 +1,83 @@
 import pytest
 from unittest.mock import patch, Mock, MagicMock
 from pathlib import Path
-import json
-import tempfile
-import shutil
+import subprocess
 from app.transcript_downloader import TranscriptDownloader
+from tests.helpers import make_files, mkfile, names, resp
+
+
+_URL_CASES = (
+    ("https://www.youtube.com/watch?v=abc123", "abc123"),
+    ("https://youtu.be/def456", "def456"),
+    ("https://www.youtube.com/embed/ghi789", "ghi789"),
+    ("https://www.youtube.com/watch?v=jkl012&feature=share", "jkl012"),
+    ("https://youtube.com/v/mno345", "mno345"),
+    ("invalid_url", None),
+)
+
+_VTT_TIME_CASES = (
+    (0.0, "00:00:00.000"),
+    (65.5, "00:01:05.500"),
+    (3661.123, "01:01:01.123"),
+)
+
+_JSON3_SAMPLE = (
+    '{"events":['
+    '{"tStartMs":0,"dDurationMs":3000,"segs":[{"utf8":"Hello world"}]},'
+    '{"tStartMs":3500,"dDurationMs":2500,"segs":[{"utf8":"Welcome to the video"}]}'
+    ']}'
+)
+
+# Fixture file contents, pre-encoded once for the whole module
+_VTT_SAMPLE = b"WEBVTT\n\ntest content"
+
+# Canned yt-dlp results, built once for the whole module
+_YTDLP_SUCCESS = resp(stdout="Downloaded successfully")
+_YTDLP_NO_SUBTITLES = resp(stdout="no subtitles available")
+_YTDLP_TIMEOUT = subprocess.TimeoutExpired("yt-dlp", 120)
+
+
+@pytest.fixture(scope="class")
+def _shared_run():
+    """One subprocess.run stand-in shared by every test in the class"""
+    return Mock()
+
+
+@pytest.fixture
+def patched_run(_shared_run, monkeypatch):
+    """Install the shared subprocess.run mock with a clean slate"""
+    _shared_run.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(subprocess, "run", _shared_run)
+    return _shared_run
 
 
 class TestTranscriptDownloaderEnhanced:
     
-    def setup_method(self):
-        """Set up test fixtures"""
-        # Create temporary cache directory
-        self.temp_dir = tempfile.mkdtemp()
+    @pytest.fixture(autouse=True)
+    def _tp(self, tmp_path):
+        """Point the downloader at pytest's per-test tmp_path (cleaned up by pytest)"""
+        self.temp_dir = str(tmp_path)
+        self.temp_path = tmp_path
         self.downloader = TranscriptDownloader(cache_dir=self.temp_dir)
     
-    def teardown_method(self):
-        """Clean up test fixtures"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    def _mk(self, name, data=b""):
+        """Create a file in the temp dir"""
+        path = self.temp_path / name
+        mkfile(path, data)
+        return path
     
-    def test_extract_video_id(self):
+    @pytest.mark.parametrize("url,expected_id", _URL_CASES)
+    def test_extract_video_id(self, url, expected_id):
         """Test video ID extraction from various URL formats"""
-        test_cases = [
-            ("https://www.youtube.com/watch?v=abc123", "abc123"),
-            ("https://youtu.be/def456", "def456"),
-            ("https://www.youtube.com/embed/ghi789", "ghi789"),
-            ("https://www.youtube.com/watch?v=jkl012&feature=share", "jkl012"),
-            ("https://youtube.com/v/mno345", "mno345"),
-            ("invalid_url", None),
-        ]
-        
-        for url, expected_id in test_cases:
-            result = self.downloader._extract_video_id(url)
-            assert result == expected_id
+        result = self.downloader._extract_video_id(url)
+        assert result == expected_id
     
     def test_find_cached_transcript(self):
         """Test finding cached transcript files"""
         video_id = "test123"
         
         # Create a test cache file
-        cache_file = Path(self.temp_dir) / f"{video_id}.vtt"
-        cache_file.write_text("WEBVTT\n\ntest content")
+        cache_file = self._mk(f"{video_id}.vtt", _VTT_SAMPLE)
         
         result = self.downloader._find_cached_transcript(video_id)
         assert result == cache_file
@@ -54,8 +91,7 @@ class TestTranscriptDownloaderEnhanced:
         video_id = "test123"
         
         # Create an empty cache file
-        cache_file = Path(self.temp_dir) / f"{video_id}.vtt"
-        cache_file.write_text("")
+        self._mk(f"{video_id}.vtt")
         
         result = self.downloader._find_cached_transcript(video_id)
         assert result is None
@@ -67,9 +103,7 @@ class TestTranscriptDownloaderEnhanced:
         youtube_url = f"https://www.youtube.com/watch?v={video_id}"
         
         # Mock response with transcript data
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = '''
+        page_html = '''
         <script>
         var ytInitialPlayerResponse = {
             "captions": {
@@ -84,8 +118,7 @@ class TestTranscriptDownloaderEnhanced:
         };
         </script>
         '''
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        mock_get.return_value = resp(text=page_html, status_code=200)
         
         with patch.object(self.downloader, '_extract_transcript_from_page') as mock_extract:
             mock_extract.return_value = [
@@ -109,22 +142,7 @@ class TestTranscriptDownloaderEnhanced:
     
     def test_parse_json3_format(self):
         """Test parsing JSON3 format transcript"""
-        json3_content = json.dumps({
-            "events": [
-                {
-                    "tStartMs": 0,
-                    "dDurationMs": 3000,
-                    "segs": [{"utf8": "Hello world"}]
-                },
-                {
-                    "tStartMs": 3500,
-                    "dDurationMs": 2500,
-                    "segs": [{"utf8": "Welcome to the video"}]
-                }
-            ]
-        })
-        
-        result = self.downloader._parse_json3_format(json3_content)
+        result = self.downloader._parse_json3_format(_JSON3_SAMPLE)
         
         assert len(result) == 2
         assert result[0]['start'] == 0.0
@@ -185,36 +203,19 @@ class TestTranscriptDownloaderEnhanced:
         assert "00:00:04.500 --> 00:00:07.200" in vtt_content
         assert "Welcome to the video" in vtt_content
     
-    def test_seconds_to_vtt_time(self):
+    @pytest.mark.parametrize("seconds,expected_time", _VTT_TIME_CASES)
+    def test_seconds_to_vtt_time(self, seconds, expected_time):
         """Test converting seconds to VTT time format"""
-        test_cases = [
-            (0.0, "00:00:00.000"),
-            (65.5, "00:01:05.500"),
-            (3661.123, "01:01:01.123"),
-        ]
-        
-        for seconds, expected_time in test_cases:
-            result = self.downloader._seconds_to_vtt_time(seconds)
-            assert result == expected_time
+        result = self.downloader._seconds_to_vtt_time(seconds)
+        assert result == expected_time
     
     @patch('requests.get')
     def test_fetch_timedtext_url_json3(self, mock_get):
         """Test fetching transcript from timedtext URL with JSON3 format"""
         url = "https://www.youtube.com/api/timedtext?v=test123&lang=en&fmt=json3"
         
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = json.dumps({
-            "events": [
-                {
-                    "tStartMs": 0,
-                    "dDurationMs": 3000,
-                    "segs": [{"utf8": "Hello world"}]
-                }
-            ]
-        })
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        json3_content = '{"events":[{"tStartMs":0,"dDurationMs":3000,"segs":[{"utf8":"Hello world"}]}]}'
+        mock_get.return_value = resp(text=json3_content, status_code=200)
         
         result = self.downloader._fetch_timedtext_url(url)
         
@@ -234,10 +235,9 @@ class TestTranscriptDownloaderEnhanced:
         session = Mock()
         video_id = "test123"
         
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = "WEBVTT\n\n00:00:00.000 --> 00:00:03.000\nHello world"
-        session.get.return_value = mock_response
+        session.get.return_value = resp(
+            text="WEBVTT\n\n00:00:00.000 --> 00:00:03.000\nHello world", status_code=200
+        )
         
         result = self.downloader._try_transcript_api(session, video_id)
         assert result is not None
@@ -288,51 +288,44 @@ class TestTranscriptDownloaderEnhanced:
         video_id = "test123"
         
         # Create test cache files
-        cache_file1 = Path(self.temp_dir) / f"{video_id}.vtt"
-        cache_file2 = Path(self.temp_dir) / f"{video_id}_auto.vtt"
-        cache_file3 = Path(self.temp_dir) / "other_video.vtt"
+        cache_file1 = self.temp_path / f"{video_id}.vtt"
+        cache_file2 = self.temp_path / f"{video_id}_auto.vtt"
+        cache_file3 = self.temp_path / "other_video.vtt"
         
-        cache_file1.write_text("test1")
-        cache_file2.write_text("test2")
-        cache_file3.write_text("test3")
+        make_files([cache_file1, cache_file2, cache_file3])
         
         self.downloader.clear_cache(video_id)
         
         # Should remove files for specific video but not others
-        assert not cache_file1.exists()
-        assert not cache_file2.exists()
-        assert cache_file3.exists()
+        remaining = names(self.temp_dir)
+        assert cache_file1.name not in remaining
+        assert cache_file2.name not in remaining
+        assert cache_file3.name in remaining
     
     def test_clear_cache_all(self):
         """Test clearing entire cache"""
         # Create test cache files
-        cache_file1 = Path(self.temp_dir) / "video1.vtt"
-        cache_file2 = Path(self.temp_dir) / "video2.srt"
-        cache_file3 = Path(self.temp_dir) / "video3.txt"  # Non-transcript file
+        cache_file1 = self.temp_path / "video1.vtt"
+        cache_file2 = self.temp_path / "video2.srt"
+        cache_file3 = self.temp_path / "video3.txt"  # Non-transcript file
         
-        cache_file1.write_text("test1")
-        cache_file2.write_text("test2")
-        cache_file3.write_text("test3")
+        make_files([cache_file1, cache_file2, cache_file3])
         
         self.downloader.clear_cache()
         
         # Should remove transcript files but not others
-        assert not cache_file1.exists()
-        assert not cache_file2.exists()
-        assert cache_file3.exists()  # Non-transcript files preserved
+        remaining = names(self.temp_dir)
+        assert cache_file1.name not in remaining
+        assert cache_file2.name not in remaining
+        assert cache_file3.name in remaining  # Non-transcript files preserved
     
-    @patch('subprocess.run')
-    def test_execute_ytdlp_command_success(self, mock_run):
+    def test_execute_ytdlp_command_success(self, patched_run):
         """Test successful yt-dlp command execution"""
-        mock_result = Mock()
-        mock_result.stdout = "Downloaded successfully"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        patched_run.return_value = _YTDLP_SUCCESS
         
         # Create a mock downloaded file
         video_id = "test123"
-        mock_file = Path(self.temp_dir) / f"{video_id}.vtt"
-        mock_file.write_text("WEBVTT\n\ntest content")
+        mock_file = self._mk(f"{video_id}.vtt", _VTT_SAMPLE)
         
         with patch.object(self.downloader, '_find_downloaded_file') as mock_find:
             mock_find.return_value = mock_file
@@ -344,24 +337,19 @@ class TestTranscriptDownloaderEnhanced:
                 
                 assert result == str(mock_file)
     
-    @patch('subprocess.run')
-    def test_execute_ytdlp_command_no_subtitles(self, mock_run):
+    def test_execute_ytdlp_command_no_subtitles(self, patched_run):
         """Test yt-dlp command when no subtitles available"""
-        mock_result = Mock()
-        mock_result.stdout = "no subtitles available"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        patched_run.return_value = _YTDLP_NO_SUBTITLES
         
         cmd = ["yt-dlp", "--help"]
         result = self.downloader._execute_ytdlp_command(cmd, "test123")
         
         assert result is None
     
-    @patch('subprocess.run')
-    def test_execute_ytdlp_command_timeout(self, mock_run):
+    def test_execute_ytdlp_command_timeout(self, patched_run, monkeypatch):
         """Test yt-dlp command timeout"""
-        import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired("yt-dlp", 120)
+        patched_run.side_effect = _YTDLP_TIMEOUT
+        monkeypatch.setattr(self.downloader, "retry_delay", 0)  # Skip real backoff sleeps
         
         cmd = ["yt-dlp", "--help"]
         result = self.downloader._execute_ytdlp_command(cmd, "test123")
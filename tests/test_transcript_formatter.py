@@ -4,7 +4,8 @@ from pathlib import Path
 from app.transcript_formatter import (
     TranscriptFormatter, 
     TranscriptFormat, 
-    TranscriptSegment
+    TranscriptSegment,
+    SegmentArray
 )
 
 
@@ -236,6 +237,32 @@ Welcome to the video"""
         assert "00:00:04.500 --> 00:00:07.200" in vtt_output
         assert "Welcome to the video" in vtt_output
     
+    def test_parse_to_array(self):
+        """Test parsing into the columnar SegmentArray"""
+        srt_content = """1
+00:00:01,000 --> 00:00:03,000
+Hello world
+
+2
+00:00:04,500 --> 00:00:06,200
+Welcome to the video"""
+        
+        array = self.formatter.parse_to_array(srt_content, TranscriptFormat.SRT)
+        
+        assert isinstance(array, SegmentArray)
+        assert len(array) == 2
+        assert array.starts.tolist() == [1.0, 4.5]
+        assert array.ends.tolist() == [3.0, 6.2]
+        assert array[1] == TranscriptSegment(4.5, 6.2, "Welcome to the video")
+        assert array.to_segments() == self.formatter.parse_to_segments(srt_content, TranscriptFormat.SRT)
+        assert list(array) == array.to_segments()
+        
+        tail = array[1:]
+        assert isinstance(tail, SegmentArray)
+        assert list(tail) == [TranscriptSegment(4.5, 6.2, "Welcome to the video")]
+        with pytest.raises(TypeError, match="integers or slices"):
+            array["1"]
+    
     def test_format_info(self):
         """Test getting format information"""
         info = self.formatter.get_format_info(TranscriptFormat.VTT)
@@ -74,7 +74,7 @@ Hello world"""
         
         # Mock the formatter to fail
         with patch('app.transcript.TranscriptParser._parse_with_formatter') as mock_formatter:
-            mock_formatter.return_value = []
+            mock_formatter.return_value = ([], TranscriptFormat.UNKNOWN)
             
             segments = TranscriptParser.parse(test_file)
             
@@ -127,6 +127,15 @@ Hello world"""
         assert "Hello" in result
         assert "world" in result
     
+    def test_read_file_with_encoding_detection_large_file(self):
+        """Test reading a file large enough to be memory-mapped"""
+        content = "WEBVTT\n\n" + "00:00:01.000 --> 00:00:03.000\nCafé 世界\n\n" * 20000
+        test_file = self.temp_path / "large.vtt"
+        test_file.write_bytes(content.replace("\n", "\r\n").encode('utf-8'))
+        
+        result = TranscriptParser._read_file_with_encoding_detection(test_file)
+        assert result == content
+    
     def test_read_file_completely_unreadable(self):
         """Test reading completely unreadable file"""
         test_file = self.temp_path / "unreadable.txt"
@@ -148,8 +157,9 @@ Hello world"""
             mock_detect.return_value = (TranscriptFormat.UNKNOWN, 0.1)
             
             # Should fall back to legacy parsing
-            segments = TranscriptParser._parse_with_formatter(test_file)
+            segments, detected_format = TranscriptParser._parse_with_formatter(test_file)
             assert segments == []
+            assert detected_format == TranscriptFormat.UNKNOWN
     
     def test_parse_with_formatter_exception_handling(self):
         """Test exception handling in formatter parsing"""
@@ -159,8 +169,9 @@ Hello world"""
         with patch('app.transcript_formatter.TranscriptFormatter.parse_to_segments') as mock_parse:
             mock_parse.side_effect = Exception("Parsing error")
             
-            segments = TranscriptParser._parse_with_formatter(test_file)
+            segments, detected_format = TranscriptParser._parse_with_formatter(test_file)
             assert segments == []
+            assert detected_format == TranscriptFormat.UNKNOWN
     
     def test_validate_segments_basic(self):
         """Test basic segment validation"""
@@ -204,6 +215,15 @@ Hello world"""
         # Should keep non-overlapping segments and handle overlaps
         assert len(valid_segments) >= 1
         assert any(seg['text'] == 'Non-overlapping segment' for seg in valid_segments)
+        
+        # Opt-in sweep keeps the earliest of each overlapping run
+        swept = TranscriptParser.validate_segments(segments, remove_overlaps=True)
+        assert [seg['text'] for seg in swept] == ['First segment', 'Non-overlapping segment']
+        
+        # Large inputs take the vectorized path and sweep the same way
+        many = [{'start': i * 0.5, 'end': i * 0.5 + 1.0, 'text': f"Segment {i}"} for i in range(40)]
+        swept = TranscriptParser.validate_segments(many, remove_overlaps=True)
+        assert [seg['start'] for seg in swept] == [float(i) for i in range(20)]
     
     def test_parse_integration_with_various_formats(self):
         """Integration test with various formats"""
@@ -224,6 +244,24 @@ Hello world"""
             assert 'text' in segments[0]
             assert segments[0]['text'].strip()  # Non-empty text
     
+    @pytest.mark.parametrize("file_count", [2, 4])
+    def test_parse_many(self, file_count):
+        """Test batch parsing serially (small batches) and across processes"""
+        test_files = []
+        for i in range(file_count):
+            test_file = self.temp_path / f"batch{i}.vtt"
+            test_file.write_text(
+                f"WEBVTT\n\n00:00:0{i}.000 --> 00:00:0{i}.500\nFile {i}\n\n00:00:10.000 --> 00:00:11.000\nEnd",
+                encoding='utf-8'
+            )
+            test_files.append(test_file)
+        
+        results = TranscriptParser.parse_many(test_files, workers=2)
+        
+        assert list(results) == test_files
+        for i, test_file in enumerate(test_files):
+            assert results[test_file][0] == {'start': float(i), 'end': i + 0.5, 'text': f"File {i}"}
+    
     def test_parse_malformed_but_recoverable(self):
         """Test parsing malformed but partially recoverable content"""
         malformed_vtt = """WEBVTT
@@ -290,4 +328,67 @@ Hello 世界! Café ñoño
         
         assert len(segments) == 100
         assert segments[0]['text'] == "Segment number 0"
-        assert segments[99]['text'] == "Segment number 99"
\ No newline at end of file
+        assert segments[99]['text'] == "Segment number 99"
+    
+    def test_iter_parse_streams_cues(self):
+        """Test streaming parse yields one segment per cue block"""
+        vtt_content = """WEBVTT
+
+1
+00:00:01.000 --> 00:00:03.000
+Hello world
+
+NOTE this block is skipped
+
+00:00:04.000 --> 00:00:06.000 align:start
+Welcome to
+the video"""
+        
+        test_file = self.temp_path / "stream.vtt"
+        test_file.write_text(vtt_content, encoding='utf-8')
+        
+        stream = TranscriptParser.iter_parse(test_file)
+        assert not isinstance(stream, list)
+        
+        assert list(stream) == [
+            {'start': 1.0, 'end': 3.0, 'text': "Hello world"},
+            {'start': 4.0, 'end': 6.0, 'text': "Welcome to the video"},
+        ]
+    
+    def test_iter_parse_matches_parse(self):
+        """Test streaming and whole-file parsing clean cue text identically"""
+        vtt_content = """WEBVTT
+
+00:00:01.000 --> 00:00:03.000
+Hello    world
+
+00:00:04.000 --> 00:00:06.500 align:start
+  Welcome  to
+the	video
+
+00:00:07.250 --> 00:00:09.000
+One   two   three"""
+        
+        test_file = self.temp_path / "same.vtt"
+        test_file.write_text(vtt_content, encoding='utf-8')
+        
+        segments = TranscriptParser.parse(test_file)
+        assert [seg['text'] for seg in segments] == ["Hello world", "Welcome to the video", "One two three"]
+        assert list(TranscriptParser.iter_parse(test_file)) == segments
+    
+    def test_iter_parse_nonexistent_file(self):
+        """Test streaming parse of a missing file"""
+        with pytest.raises(FileNotFoundError):
+            list(TranscriptParser.iter_parse(self.temp_path / "missing.vtt"))
+    
+    @pytest.mark.parametrize("content,expected", [
+        (b"\xef\xbb\xbfWEBVTT\n\n00:00:01.000 --> 00:00:02.000\nHi", TranscriptFormat.VTT),
+        (b"\n1\r\n00:00:01,000 --> 00:00:02,000\r\nHi", TranscriptFormat.SRT),
+        (b"just some notes", TranscriptFormat.UNKNOWN),
+    ])
+    def test_sniff_format(self, content, expected):
+        """Test format sniffing from the head of a file"""
+        test_file = self.temp_path / "sniff.txt"
+        test_file.write_bytes(content)
+        
+        assert TranscriptParser._sniff_format(test_file) == expected
@@ -1,3 +1,4 @@
+import io
 import pytest
 from unittest.mock import patch, Mock, MagicMock
 from pathlib import Path
@@ -6,6 +7,26 @@ import shutil
 from PIL import Image
 import numpy as np
 from app.video import VideoProcessor
+from tests.helpers import resp
+
+_MAXRES_DEFAULT = "https://i3.ytimg.com/vi/test123/maxresdefault.jpg"
+_HQ_DEFAULT = "https://img.youtube.com/vi/test123/hqdefault.jpg"
+
+
+def _jpeg_bytes():
+    """Encode a plain red 1280x720 frame as JPEG bytes"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (1280, 720), (255, 0, 0)).save(buffer, format='JPEG')
+    return buffer.getvalue()
+
+
+def _shared_thumbnail_get(content):
+    """Fake Session.get where per-segment maxresN URLs 404 and shared variants return content"""
+    def fake_get(url, timeout):
+        if "/maxres" in url and "maxresdefault" not in url:
+            raise Exception("404 Not Found")
+        return resp(content=content)
+    return fake_get
 
 
 class TestVideoProcessorEnhanced:
@@ -134,6 +155,27 @@ class TestVideoProcessorEnhanced:
         
         assert self.processor._validate_cached_video(test_file) == True
     
+    @patch('app.video.VideoFileClip')
+    def test_validate_cached_video_opens_clip_once(self, mock_clip):
+        """Test a validated video is not re-opened, even by a new processor, until the file changes"""
+        test_file = Path(self.temp_dir) / "valid_video.mp4"
+        test_file.write_bytes(b"x" * 500000)  # 500KB
+        
+        mock_instance = MagicMock()
+        mock_instance.__enter__.return_value = mock_instance
+        mock_instance.duration = 100.0
+        mock_instance.get_frame.return_value = np.random.randint(0, 255, (720, 1280, 3), dtype=np.uint8)
+        mock_clip.return_value = mock_instance
+        
+        assert self.processor._validate_cached_video(test_file) == True
+        assert self.processor._validate_cached_video(test_file) == True
+        assert VideoProcessor(self.temp_dir)._validate_cached_video(test_file) == True
+        assert mock_clip.call_count == 1
+        
+        test_file.write_bytes(b"y" * 600000)  # re-downloaded
+        assert self.processor._validate_cached_video(test_file) == True
+        assert mock_clip.call_count == 2
+    
     @patch('app.video.YouTube')
     def test_select_optimal_stream_exact_match(self, mock_youtube):
         """Test optimal stream selection with exact quality match"""
@@ -178,7 +220,7 @@ class TestVideoProcessorEnhanced:
         # Should be different from original due to styling
         assert styled != test_img
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_try_youtube_timestamp_thumbnails_success(self, mock_get):
         """Test YouTube timestamp thumbnail download success"""
         self.processor.video_id = "test123"
@@ -211,7 +253,7 @@ class TestVideoProcessorEnhanced:
             if thumbnail_path:
                 assert Path(thumbnail_path).exists()
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_try_youtube_timestamp_thumbnails_failure(self, mock_get):
         """Test YouTube timestamp thumbnail download failure"""
         self.processor.video_id = "test123"
@@ -225,6 +267,57 @@ class TestVideoProcessorEnhanced:
         
         assert result is None
     
+    @patch('requests.Session.get')
+    def test_try_youtube_timestamp_thumbnails_downloads_shared_variant_once(self, mock_get):
+        """Test the shared fallback thumbnail is fetched once for all segments"""
+        self.processor.video_id = "test123"
+        mock_get.side_effect = _shared_thumbnail_get(_jpeg_bytes())
+        
+        segments = [{'start': 10.0}, {'start': 30.0}, {'start': 60.0}]
+        
+        result = self.processor._try_youtube_timestamp_thumbnails(segments)
+        
+        assert len(result) == 3 and all(result)
+        requested = [call.args[0] for call in mock_get.call_args_list]
+        assert requested.count(_MAXRES_DEFAULT) == 1
+    
+    @patch('requests.Session.get')
+    def test_try_youtube_timestamp_thumbnails_reuses_shared_variant_after_styling_failure(self, mock_get):
+        """Test a styling failure leaves the cached shared image usable for later segments"""
+        self.processor.video_id = "test123"
+        mock_get.side_effect = _shared_thumbnail_get(_jpeg_bytes())
+        
+        style = self.processor._style_timestamp_thumbnail
+        calls = []
+        
+        def fail_first_style(*args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise Exception("styling failed")
+            return style(*args)
+        
+        with patch.object(self.processor, '_style_timestamp_thumbnail', side_effect=fail_first_style):
+            result = self.processor._try_youtube_timestamp_thumbnails([{'start': 10.0}, {'start': 30.0}])
+        
+        assert len(result) == 2 and all(result)
+        requested = [call.args[0] for call in mock_get.call_args_list]
+        assert requested.count(_MAXRES_DEFAULT) == 1
+    
+    @patch('requests.Session.get')
+    def test_try_youtube_timestamp_thumbnails_undecodable_shared_variant_fetched_once(self, mock_get):
+        """Test shared variants whose bytes cannot be decoded are not re-requested per segment"""
+        self.processor.video_id = "test123"
+        mock_get.side_effect = _shared_thumbnail_get(b"not an image")
+        
+        segments = [{'start': float(i * 10)} for i in range(5)]
+        
+        result = self.processor._try_youtube_timestamp_thumbnails(segments)
+        
+        assert result is None
+        requested = [call.args[0] for call in mock_get.call_args_list]
+        assert requested.count(_MAXRES_DEFAULT) == 1
+        assert requested.count(_HQ_DEFAULT) == 1
+
     @patch('app.video.VideoFileClip')
     def test_extract_thumbnails_success(self, mock_clip):
         """Test successful thumbnail extraction from video"""
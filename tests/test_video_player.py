@@ -1,193 +1,145 @@
 import pytest
 from pathlib import Path
-import tempfile
-import shutil
 from app.html_generator import HTMLGenerator
 
 
-class TestVideoPlayerEnhancements:
-    
-    def setup_method(self):
-        """Set up test fixtures"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.generator = HTMLGenerator(self.temp_dir)
+def assert_all_present(html, needles):
+    """Assert every needle occurs in html, reporting all that are missing"""
+    missing = [needle for needle in needles if needle not in html]
+    assert not missing, f"Missing from generated HTML: {missing}"
+
+
+@pytest.fixture(scope="class")
+def generated_html(tmp_path_factory):
+    """Generate one representative page shared by every test in the class"""
+    generator = HTMLGenerator(tmp_path_factory.mktemp("gen"))
+    youtube_url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+    segments = [
+        {'start': 10.5, 'end': 25.0, 'text': 'First segment', 'summary': 'First'},
+        {'start': 45.7, 'end': 60.0, 'text': 'Second segment'},
+        {'start': 120.0, 'end': 135.0, 'text': 'Third segment'}
+    ]
     
-    def teardown_method(self):
-        """Clean up test fixtures"""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    html_path = generator.generate(youtube_url, 'Test Video', 'Test Highlights', segments, [None] * 3)
+    return Path(html_path).read_bytes()
+
+
+class TestVideoPlayerEnhancements:
     
-    def test_html_contains_enhanced_player_features(self):
+    def test_html_contains_enhanced_player_features(self, generated_html):
         """Test that HTML contains all enhanced video player features"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        video_title = 'Test Video'
-        description = 'Test Highlights'
-        segments = [
-            {'start': 10.0, 'end': 15.0, 'text': 'Test segment', 'summary': 'Test'},
-        ]
-        thumbnails = [None]
-        
-        html_path = self.generator.generate(youtube_url, video_title, description, segments, thumbnails)
-        html_content = Path(html_path).read_text()
-        
         # Check for enhanced player features
-        assert 'youtube-player-container' in html_content
-        assert 'debugLog' in html_content
-        assert 'loadYouTubeAPI' in html_content
-        assert 'onYouTubeIframeAPIReady' in html_content
-        assert 'fallbackMode' in html_content
-        assert 'playerReady' in html_content
-        assert 'pendingSeek' in html_content
-        assert 'retryCount' in html_content
+        assert_all_present(generated_html, [
+            b'youtube-player-container',
+            b'debugLog',
+            b'loadYouTubeAPI',
+            b'onYouTubeIframeAPIReady',
+            b'fallbackMode',
+            b'playerReady',
+            b'pendingSeek',
+            b'retryCount',
+        ])
     
-    def test_html_contains_error_handling(self):
+    def test_html_contains_error_handling(self, generated_html):
         """Test that HTML contains comprehensive error handling"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [{'start': 10.0, 'end': 15.0, 'text': 'Test'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check for error handling features
-        assert 'onPlayerError' in html_content
-        assert 'setupFallbackMode' in html_content
-        assert 'testPlayerFunctionality' in html_content
-        assert 'API loading timeout' in html_content
-        assert 'Max retries reached' in html_content
+        assert_all_present(generated_html, [
+            b'onPlayerError',
+            b'setupFallbackMode',
+            b'testPlayerFunctionality',
+            b'API loading timeout',
+            b'Max retries reached',
+        ])
     
-    def test_html_contains_multiple_seek_methods(self):
+    def test_html_contains_multiple_seek_methods(self, generated_html):
         """Test that HTML contains multiple seek fallback methods"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [{'start': 30.0, 'end': 45.0, 'text': 'Test segment'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check for multiple seek methods
-        assert 'seekToTime' in html_content
-        assert 'player.seekTo' in html_content
-        assert 'useIframeSrcSeek' in html_content
-        assert 'iframe.src' in html_content
-        assert 'window.open' in html_content
-        assert 'Seek verification' in html_content
+        assert_all_present(generated_html, [
+            b'seekToTime',
+            b'player.seekTo',
+            b'useIframeSrcSeek',
+            b'iframe.src',
+            b'window.open',
+            b'Seek verification',
+        ])
     
-    def test_html_contains_visual_feedback(self):
+    def test_html_contains_visual_feedback(self, generated_html):
         """Test that HTML contains visual feedback features"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [{'start': 60.0, 'end': 75.0, 'text': 'Test segment'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check for visual feedback features
-        assert 'showSeekingFeedback' in html_content
-        assert 'highlightActiveSegment' in html_content
-        assert 'segment-active' in html_content
-        assert 'showLoadingState' in html_content
-        assert 'hideLoadingState' in html_content
-        assert 'player-loading' in html_content
+        assert_all_present(generated_html, [
+            b'showSeekingFeedback',
+            b'highlightActiveSegment',
+            b'segment-active',
+            b'showLoadingState',
+            b'hideLoadingState',
+            b'player-loading',
+        ])
     
-    def test_segment_timestamps_properly_embedded(self):
+    def test_segment_timestamps_properly_embedded(self, generated_html):
         """Test that segment timestamps are properly embedded in HTML"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [
-            {'start': 10.5, 'end': 25.0, 'text': 'First segment'},
-            {'start': 45.7, 'end': 60.0, 'text': 'Second segment'},
-            {'start': 120.0, 'end': 135.0, 'text': 'Third segment'}
-        ]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None] * 3)
-        html_content = Path(html_path).read_text()
-        
         # Check that timestamps are properly converted to integers and embedded
-        assert 'data-timestamp="10"' in html_content
-        assert 'data-timestamp="45"' in html_content  
-        assert 'data-timestamp="120"' in html_content
-        
-        # Check that formatted timestamps are displayed
-        assert '00:10' in html_content  # 10 seconds
-        assert '00:45' in html_content  # 45 seconds
-        assert '02:00' in html_content  # 120 seconds
+        assert_all_present(generated_html, [
+            b'data-timestamp="10"',
+            b'data-timestamp="45"',
+            b'data-timestamp="120"',
+            b'00:10',
+            b'00:45',
+            b'02:00',
+        ])
     
-    def test_html_contains_debug_functionality(self):
+    def test_html_contains_debug_functionality(self, generated_html):
         """Test that HTML contains debug functionality for troubleshooting"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [{'start': 30.0, 'end': 45.0, 'text': 'Test'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check for debug features
-        assert 'window.debugVideoPlayer' in html_content
-        assert '[VideoPlayer]' in html_content
-        assert 'debugLog' in html_content
+        assert_all_present(generated_html, [
+            b'window.debugVideoPlayer',
+            b'[VideoPlayer]',
+            b'debugLog',
+        ])
     
-    def test_html_contains_loading_states(self):
+    def test_html_contains_loading_states(self, generated_html):
         """Test that HTML contains proper loading state management"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [{'start': 30.0, 'end': 45.0, 'text': 'Test'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check for loading state elements
-        assert 'player-loading' in html_content
-        assert 'Loading video player' in html_content
-        assert '@keyframes loading' in html_content
-        assert 'showLoadingState' in html_content
-        assert 'hideLoadingState' in html_content
+        assert_all_present(generated_html, [
+            b'player-loading',
+            b'Loading video player',
+            b'@keyframes loading',
+            b'showLoadingState',
+            b'hideLoadingState',
+        ])
     
-    def test_video_id_extraction(self):
+    def test_video_id_extraction(self, generated_html):
         """Test that video ID is properly extracted and used"""
-        youtube_url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
-        segments = [{'start': 30.0, 'end': 45.0, 'text': 'Test'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check that video ID is properly embedded
-        assert 'dQw4w9WgXcQ' in html_content
-        assert "let videoId = 'dQw4w9WgXcQ'" in html_content
+        assert_all_present(generated_html, [
+            b'dQw4w9WgXcQ',
+            b"let videoId = 'dQw4w9WgXcQ'",
+        ])
     
-    def test_fallback_message_content(self):
+    def test_fallback_message_content(self, generated_html):
         """Test that fallback message is informative"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [{'start': 30.0, 'end': 45.0, 'text': 'Test'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check fallback message content
-        assert 'Video embedding is disabled' in html_content
-        assert 'Click a segment below to open it directly on YouTube' in html_content
-        assert 'Watch Full Video on YouTube' in html_content
+        assert_all_present(generated_html, [
+            b'Video embedding is disabled',
+            b'Click a segment below to open it directly on YouTube',
+            b'Watch Full Video on YouTube',
+        ])
     
-    def test_click_handler_setup(self):
+    def test_click_handler_setup(self, generated_html):
         """Test that click handlers are properly set up"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [
-            {'start': 10.0, 'end': 15.0, 'text': 'First'},
-            {'start': 30.0, 'end': 35.0, 'text': 'Second'}
-        ]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None] * 2)
-        html_content = Path(html_path).read_text()
-        
         # Check that click handlers are set up
-        assert 'setupCardClickHandlers' in html_content
-        assert 'addEventListener(\'click\',' in html_content
-        assert 'watch-btn' in html_content
-        assert 'preventDefault()' in html_content
+        assert_all_present(generated_html, [
+            b'setupCardClickHandlers',
+            b'addEventListener(\'click\',',
+            b'watch-btn',
+            b'preventDefault()',
+        ])
     
-    def test_css_animations_included(self):
+    def test_css_animations_included(self, generated_html):
         """Test that CSS animations are included for visual feedback"""
-        youtube_url = 'https://www.youtube.com/watch?v=test123'
-        segments = [{'start': 30.0, 'end': 45.0, 'text': 'Test'}]
-        
-        html_path = self.generator.generate(youtube_url, 'Test', 'Test', segments, [None])
-        html_content = Path(html_path).read_text()
-        
         # Check for CSS animations
-        assert '@keyframes loading' in html_content
-        assert 'segment-active' in html_content
-        assert 'transform: translateX' in html_content
-        assert 'transition:' in html_content
\ No newline at end of file
+        assert_all_present(generated_html, [
+            b'@keyframes loading',
+            b'segment-active',
+            b'transform: translateX',
+            b'transition:',
+        ])
\ No newline at end of file
@@ -7,7 +7,10 @@ Comprehensive validation of installation and dependencies
 import sys
 import os
 import importlib
+import importlib.metadata
+import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 
@@ -74,12 +77,26 @@ def check_virtual_environment() -> Tuple[bool, str]:
         print_status(f"Failed to check virtual environment: {e}", "error")
         return False, "error"
 
+# Distribution names for modules whose import name differs from the package
+MODULE_DISTRIBUTIONS = {
+    'moviepy.editor': 'moviepy',
+    'PIL': 'pillow',
+    'bs4': 'beautifulsoup4',
+    'yaml': 'pyyaml',
+    'yt_dlp': 'yt-dlp',
+}
+
 def check_module_import(module_name: str, display_name: str = None) -> Tuple[bool, str]:
     """Check if a Python module can be imported"""
     display = display_name or module_name
     try:
         module = importlib.import_module(module_name)
-        version = getattr(module, '__version__', 'unknown')
+        # Take the version from the installed distribution's metadata, since
+        # several packages (moviepy.editor, yt_dlp) do not set __version__
+        try:
+            version = importlib.metadata.version(MODULE_DISTRIBUTIONS.get(module_name, module_name))
+        except importlib.metadata.PackageNotFoundError:
+            version = getattr(module, '__version__', 'unknown')
         print_status(f"{display}: v{version}", "success")
         return True, version
     except ImportError as e:
@@ -116,6 +133,15 @@ def check_critical_modules() -> Dict[str, bool]:
     
     return results
 
+def _probe_command(cmd: str) -> subprocess.CompletedProcess:
+    """Run `cmd --version`, skipping the spawn when cmd is not on PATH"""
+    if shutil.which(cmd) is None:
+        raise FileNotFoundError(cmd)
+    return subprocess.run([cmd, '--version'], 
+                          capture_output=True, 
+                          text=True, 
+                          timeout=5)
+
 def check_system_commands() -> Dict[str, bool]:
     """Check for required system commands"""
     commands = {
@@ -127,12 +153,13 @@ def check_system_commands() -> Dict[str, bool]:
     results = {}
     print_status("Checking system commands...", "cyan")
     
+    # Probe all commands concurrently; results are reported in declaration order
+    with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+        probes = {cmd: pool.submit(_probe_command, cmd) for cmd in commands}
+    
     for cmd, description in commands.items():
         try:
-            result = subprocess.run([cmd, '--version'], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=5)
+            result = probes[cmd].result()
             # FFmpeg outputs version to stderr and returns exit code 8, but this is normal
             if result.returncode == 0 or (cmd == 'ffmpeg' and 'ffmpeg version' in result.stderr):
                 print_status(f"{description}: Available", "success")
@@ -167,9 +194,18 @@ def check_project_structure() -> Dict[str, bool]:
     results = {}
     print_status("Checking project structure...", "cyan")
     
+    # List each parent directory once rather than stat-ing every file
+    listings = {}
+    for parent in {os.path.dirname(file_path) or '.' for file_path in required_files}:
+        try:
+            with os.scandir(parent) as entries:
+                listings[parent] = {entry.name for entry in entries}
+        except (FileNotFoundError, NotADirectoryError):
+            listings[parent] = set()
+    
     for file_path, description in required_files.items():
-        path = Path(file_path)
-        if path.exists():
+        parent, name = os.path.split(file_path)
+        if name in listings[parent or '.']:
             print_status(f"{description}: Found", "success")
             results[file_path] = True
         else:
@@ -183,38 +219,37 @@ def check_cli_functionality() -> bool:
     print_status("Testing CLI functionality...", "cyan")
     
     try:
+        # Invoke the Typer app in-process rather than paying for a fresh
+        # interpreter and full app import per command
+        from typer.testing import CliRunner
+        from app.cli import app
+        
+        runner = CliRunner()
+        
         # Test CLI help
-        result = subprocess.run([
-            sys.executable, 'app/cli.py', '--help'
-        ], capture_output=True, text=True, timeout=10, cwd=project_root)
+        result = runner.invoke(app, ['--help'])
         
-        if result.returncode == 0 and 'Usage:' in result.stdout:
+        if result.exit_code == 0 and 'Usage:' in result.stdout:
             print_status("CLI help command: Working", "success")
             
             # Test transcript validation if sample exists
-            sample_path = Path('tests/sample.vtt')
+            sample_path = project_root / 'tests' / 'sample.vtt'
             if sample_path.exists():
-                result = subprocess.run([
-                    sys.executable, 'app/cli.py', 'validate-transcript', str(sample_path)
-                ], capture_output=True, text=True, timeout=10, cwd=project_root,
-                  env={**os.environ, 'PYTHONPATH': str(project_root)})
+                result = runner.invoke(app, ['validate-transcript', str(sample_path)])
                 
-                if result.returncode == 0:
+                if result.exit_code == 0:
                     print_status("CLI transcript validation: Working", "success")
                     return True
                 else:
-                    print_status(f"CLI transcript validation failed: {result.stderr}", "error")
+                    print_status(f"CLI transcript validation failed: {result.exception or result.output}", "error")
                     return False
             else:
                 print_status("Sample transcript not found, skipping validation test", "warning")
                 return True
         else:
-            print_status(f"CLI help failed: {result.stderr}", "error")
+            print_status(f"CLI help failed: {result.exception or result.output}", "error")
             return False
             
-    except subprocess.TimeoutExpired:
-        print_status("CLI test timed out", "error")
-        return False
     except Exception as e:
         print_status(f"CLI test error: {e}", "error")
         return False
@@ -225,31 +260,26 @@ def generate_report(results: Dict) -> None:
     print_status("VALIDATION REPORT", "cyan")
     print("="*60)
     
-    # Count successes and failures
-    total_checks = 0
-    passed_checks = 0
-    critical_failures = []
-    
+    # Flatten every check into (item, failure label, passed, critical) rows
+    # while printing, then tally the rows in one go
+    checks = []
     for category, items in results.items():
         print_status(f"\n{category.upper()}:", "cyan")
         if isinstance(items, dict):
-            for item, status in items.items():
-                total_checks += 1
-                if status:
-                    passed_checks += 1
-                    print(f"  ✅ {item}")
-                else:
-                    print(f"  ❌ {item}")
-                    if category in ['modules', 'cli'] or item == 'ffmpeg':
-                        critical_failures.append(f"{category}/{item}")
+            critical_category = category in ('modules', 'cli')
+            rows = [(item, f"{category}/{item}", bool(status), critical_category or item == 'ffmpeg')
+                    for item, status in items.items()]
         elif isinstance(items, bool):
-            total_checks += 1
-            if items:
-                passed_checks += 1
-                print(f"  ✅ {category}")
-            else:
-                print(f"  ❌ {category}")
-                critical_failures.append(category)
+            rows = [(category, category, items, True)]
+        else:
+            rows = []
+        for item, _, status, _ in rows:
+            print(f"  {'✅' if status else '❌'} {item}")
+        checks.extend(rows)
+    
+    total_checks = len(checks)
+    passed_checks = sum(status for _, _, status, _ in checks)
+    critical_failures = [label for _, label, status, critical in checks if critical and not status]
     
     print("\n" + "="*60)
     print_status(f"SUMMARY: {passed_checks}/{total_checks} checks passed", "cyan")